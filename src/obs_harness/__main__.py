@@ -174,7 +174,10 @@ def main() -> None:
         )
     elif ssl_certfile:
         # Run both HTTP and HTTPS servers
-        asyncio.run(_run_dual_servers(args, ssl_certfile, ssl_keyfile, https_port))
+        asyncio.run(
+            _run_dual_servers(args, ssl_certfile, ssl_keyfile, https_port),
+            loop_factory=_get_loop_factory(),
+        )
     else:
         # HTTP only
         from .app import create_app
@@ -187,6 +190,19 @@ def main() -> None:
         )
 
 
+def _get_loop_factory():
+    """Get uvloop's loop factory if available (installed with uvicorn[standard]).
+
+    uvicorn.run() already picks uvloop itself; this covers the dual-server
+    path, which starts its own event loop.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
 async def _run_dual_servers(args, ssl_certfile: str, ssl_keyfile: str, https_port: int) -> None:
     """Run both HTTP and HTTPS servers concurrently."""
     import uvicorn
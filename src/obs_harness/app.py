@@ -5,9 +5,8 @@ import json
 import logging
 import os
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 from contextlib import asynccontextmanager
-from datetime import datetime
 from pathlib import Path
 from typing import Any, Union
 
@@ -24,16 +23,17 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
+from pydantic import BaseModel, TypeAdapter
 from sqlmodel import select, delete
 
 from .chat_pipeline import ChatPipeline, ChatPipelineConfig
 from .database import close_db, get_session, init_db
-from .elevenlabs import ElevenLabsClient, ElevenLabsError
-from .tts import TTSProviderType, ElevenLabsWSError, CartesiaWSError, ElevenLabsSettings, CartesiaSettings
+from .elevenlabs import ElevenLabsClient, ElevenLabsError, close_http_clients as close_elevenlabs_clients
+from .tts import TTSProviderType, ElevenLabsWSError, CartesiaWSError, ElevenLabsSettings, CartesiaSettings, WordTiming
 from .tts_pipeline import TTSStreamer, TTSStreamConfig, TextDisplayConfig
-from .openrouter import OpenRouterClient
+from .openrouter import OpenRouterClient, close_http_clients as close_openrouter_clients
 from .models import (
     Character,
     CharacterCreate,
@@ -71,11 +71,36 @@ from .models import (
     VolumeCommand,
     WordTimingCommand,
     get_character_tts_config,
+    utc_now,
 )
 from .twitch_eventsub import TwitchEventSubManager, ChannelPointRedemption, ChatMessage
 from .santa_session import SantaSessionManager, SantaState, SessionData
 
 
+# Columns needed to rebuild chat memory - selecting them directly returns
+# plain rows and skips ORM instance construction and identity-map tracking
+CONVERSATION_MESSAGE_COLUMNS = (
+    ConversationMessage.role,
+    ConversationMessage.content,
+    ConversationMessage.interrupted,
+    ConversationMessage.generated_text,
+)
+
+# Live status fields on CharacterResponse that come from the connection
+# manager rather than the database
+CHARACTER_STATUS_FIELDS = ("connected", "playing", "streaming")
+
+# Character columns backing CharacterResponse, selected as plain rows
+CHARACTER_RESPONSE_COLUMNS = tuple(
+    getattr(Character, field)
+    for field in CharacterResponse.model_fields
+    if field not in CHARACTER_STATUS_FIELDS
+)
+
+# Serializes character responses straight to JSON bytes
+CHARACTER_LIST_ADAPTER = TypeAdapter(list[CharacterResponse])
+
+
 class ConnectionManager:
     """Manages WebSocket connections for all channels."""
 
@@ -88,6 +113,17 @@ class ConnectionManager:
         self._channel_state: dict[str, dict[str, Any]] = {}
         self._dashboard_connections: list[WebSocket] = []
         self._last_pong: dict[WebSocket, float] = {}  # Track last pong time per connection
+        # Set (then replaced) whenever channel state changes, to wake waiters
+        self._state_changed = asyncio.Event()
+
+    def state_change_event(self) -> asyncio.Event:
+        """Get the event that will be set on the next channel state change."""
+        return self._state_changed
+
+    def _signal_state_change(self) -> None:
+        """Wake everything waiting on the current state change event."""
+        self._state_changed.set()
+        self._state_changed = asyncio.Event()
 
     async def connect(self, channel: str, websocket: WebSocket) -> None:
         """Register a channel connection (supports multiple per channel)."""
@@ -119,6 +155,7 @@ class ConnectionManager:
             if not self._connections[channel]:
                 del self._connections[channel]
                 self._channel_state.pop(channel, None)
+                self._signal_state_change()
         else:
             # Remove all connections for channel
             for ws in self._connections[channel]:
@@ -126,6 +163,7 @@ class ConnectionManager:
             logger.info(f"WebSocket disconnected: {channel} (all connections)")
             del self._connections[channel]
             self._channel_state.pop(channel, None)
+            self._signal_state_change()
 
     async def connect_dashboard(self, websocket: WebSocket) -> None:
         """Register a dashboard connection."""
@@ -143,12 +181,20 @@ class ConnectionManager:
 
     async def send_to_channel(self, channel: str, message: dict) -> bool:
         """Send a JSON message to all connections on a channel."""
+        if channel not in self._connections or not self._connections[channel]:
+            return False
+        # Serialize once for all connections (same encoding as send_json)
+        text = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+        return await self.send_text_to_channel(channel, text)
+
+    async def send_text_to_channel(self, channel: str, text: str) -> bool:
+        """Send pre-serialized JSON text to all connections on a channel."""
         if channel not in self._connections or not self._connections[channel]:
             return False
         failed = []
         for ws in self._connections[channel][:]:  # Copy list to allow removal
             try:
-                await ws.send_json(message)
+                await ws.send_text(text)
             except Exception:
                 failed.append(ws)
         # Clean up failed connections
@@ -192,6 +238,7 @@ class ConnectionManager:
         """Update channel state and notify dashboard."""
         if channel in self._channel_state:
             self._channel_state[channel][key] = value
+            self._signal_state_change()
             await self._notify_dashboard()
 
     async def _notify_dashboard(self) -> None:
@@ -219,15 +266,31 @@ class ConnectionManager:
 class OBSHarness:
     """API for controlling audio and text on OBS browser sources."""
 
+    # Commands without fields always serialize the same - build their JSON once
+    STOP_JSON = StopCommand().model_dump_json()
+    STREAM_END_JSON = StreamEndCommand().model_dump_json()
+    STOP_STREAM_JSON = StopStreamCommand().model_dump_json()
+    CLEAR_TEXT_JSON = ClearTextCommand().model_dump_json()
+    TEXT_STREAM_END_JSON = TextStreamEndCommand().model_dump_json()
+
+    # Playback log rows are buffered and written in batches off the hot path
+    LOG_FLUSH_INTERVAL = 0.25  # seconds
+    LOG_BUFFER_MAX = 1000  # Oldest rows are dropped if the database falls behind
+
     def __init__(self, manager: ConnectionManager) -> None:
         self._manager = manager
+        self._log_buffer: deque[PlaybackLog] = deque(maxlen=self.LOG_BUFFER_MAX)
+
+    async def _send_command(self, channel: str, cmd: BaseModel) -> bool:
+        """Send a command, serialized straight to JSON by Pydantic."""
+        return await self._manager.send_text_to_channel(channel, cmd.model_dump_json())
 
     async def play(
         self, channel: str, file: str, volume: float = 1.0, loop: bool = False
     ) -> bool:
         """Play an audio file on a channel."""
-        cmd = PlayCommand(file=f"/static/audio/{file}", volume=volume, loop=loop)
-        success = await self._manager.send_to_channel(channel, cmd.model_dump())
+        cmd = PlayCommand.build(file=f"/static/audio/{file}", volume=volume, loop=loop)
+        success = await self._send_command(channel, cmd)
         if success:
             await self._manager.set_channel_state(channel, "playing", True)
             await self._log_playback(channel, file, "audio")
@@ -235,23 +298,22 @@ class OBSHarness:
 
     async def stop(self, channel: str) -> bool:
         """Stop audio on a channel."""
-        cmd = StopCommand()
-        success = await self._manager.send_to_channel(channel, cmd.model_dump())
+        success = await self._manager.send_text_to_channel(channel, self.STOP_JSON)
         if success:
             await self._manager.set_channel_state(channel, "playing", False)
         return success
 
     async def set_volume(self, channel: str, level: float) -> bool:
         """Set volume level on a channel."""
-        cmd = VolumeCommand(level=level)
-        return await self._manager.send_to_channel(channel, cmd.model_dump())
+        cmd = VolumeCommand.build(level=level)
+        return await self._send_command(channel, cmd)
 
     async def stream_start(
         self, channel: str, sample_rate: int = 24000, channels: int = 1
     ) -> bool:
         """Start an audio stream on a channel."""
-        cmd = StreamStartCommand(sample_rate=sample_rate, channels=channels)
-        success = await self._manager.send_to_channel(channel, cmd.model_dump())
+        cmd = StreamStartCommand.build(sample_rate=sample_rate, channels=channels)
+        success = await self._send_command(channel, cmd)
         if success:
             await self._manager.set_channel_state(channel, "streaming", True)
             await self._log_playback(channel, "stream", "stream")
@@ -268,14 +330,12 @@ class OBSHarness:
         Note: streaming state is NOT set to False here - it's set when browser
         reports stream_ended event, so dashboard knows when playback finishes.
         """
-        cmd = StreamEndCommand()
         logger.debug(f"[{channel}] Audio stream ended")
-        return await self._manager.send_to_channel(channel, cmd.model_dump())
+        return await self._manager.send_text_to_channel(channel, self.STREAM_END_JSON)
 
     async def stop_stream(self, channel: str) -> bool:
         """Forcefully stop audio stream and clear playback on a channel."""
-        cmd = StopStreamCommand()
-        success = await self._manager.send_to_channel(channel, cmd.model_dump())
+        success = await self._manager.send_text_to_channel(channel, self.STOP_STREAM_JSON)
         if success:
             await self._manager.set_channel_state(channel, "streaming", False)
         return success
@@ -295,7 +355,7 @@ class OBSHarness:
         stroke_width: int = 0,
     ) -> bool:
         """Display animated text on a channel."""
-        cmd = TextCommand(
+        cmd = TextCommand.build(
             text=text,
             style=style,
             duration=duration,
@@ -307,15 +367,14 @@ class OBSHarness:
             stroke_color=stroke_color,
             stroke_width=stroke_width,
         )
-        success = await self._manager.send_to_channel(channel, cmd.model_dump())
+        success = await self._send_command(channel, cmd)
         if success:
             await self._log_playback(channel, text, "text")
         return success
 
     async def clear_text(self, channel: str) -> bool:
         """Clear text overlay on a channel."""
-        cmd = ClearTextCommand()
-        return await self._manager.send_to_channel(channel, cmd.model_dump())
+        return await self._manager.send_text_to_channel(channel, self.CLEAR_TEXT_JSON)
 
     async def text_stream_start(
         self,
@@ -330,7 +389,7 @@ class OBSHarness:
         instant_reveal: bool = False,
     ) -> bool:
         """Start streaming text on a channel."""
-        cmd = TextStreamStartCommand(
+        cmd = TextStreamStartCommand.build(
             font_family=font_family,
             font_size=font_size,
             color=color,
@@ -340,22 +399,25 @@ class OBSHarness:
             position_y=position_y,
             instant_reveal=instant_reveal,
         )
-        return await self._manager.send_to_channel(channel, cmd.model_dump())
+        return await self._send_command(channel, cmd)
 
     async def text_chunk(self, channel: str, text: str) -> bool:
         """Send text chunk to a channel for streaming display."""
-        cmd = TextChunkCommand(text=text)
-        return await self._manager.send_to_channel(channel, cmd.model_dump())
+        cmd = TextChunkCommand.build(text=text)
+        return await self._send_command(channel, cmd)
 
     async def text_stream_end(self, channel: str) -> bool:
         """End streaming text on a channel."""
-        cmd = TextStreamEndCommand()
-        return await self._manager.send_to_channel(channel, cmd.model_dump())
+        return await self._manager.send_text_to_channel(channel, self.TEXT_STREAM_END_JSON)
 
-    async def word_timing(self, channel: str, words: list[dict]) -> bool:
+    async def word_timing(self, channel: str, words: list[WordTiming]) -> bool:
         """Send word timing data to a channel for synced text reveal."""
-        cmd = WordTimingCommand(words=words)
-        return await self._manager.send_to_channel(channel, cmd.model_dump())
+        cmd = WordTimingCommand.build(
+            words=[w.word for w in words],
+            starts=[w.start_time for w in words],
+            ends=[w.end_time for w in words],
+        )
+        return await self._send_command(channel, cmd)
 
     def list_characters(self) -> list[CharacterStatus]:
         """Get list of connected characters."""
@@ -379,23 +441,44 @@ class OBSHarness:
         Returns:
             True if stream completed, False if timeout
         """
-        import asyncio
-        start = asyncio.get_event_loop().time()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
         while self.is_streaming(channel):
-            if asyncio.get_event_loop().time() - start > timeout:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            # Grab the event before awaiting so a change can't slip in between
+            state_changed = self._manager.state_change_event()
+            try:
+                await asyncio.wait_for(state_changed.wait(), remaining)
+            except TimeoutError:
                 return False
-            await asyncio.sleep(0.1)  # Poll every 100ms
         return True
 
     async def _log_playback(self, channel: str, content: str, content_type: str) -> None:
-        """Log a playback event."""
+        """Log a playback event (buffered until the next flush)."""
+        self._log_buffer.append(
+            PlaybackLog(channel=channel, content=content, content_type=content_type)
+        )
+
+    async def flush_playback_log(self) -> None:
+        """Write all buffered playback log rows in a single transaction."""
+        if not self._log_buffer:
+            return
+        logs = list(self._log_buffer)
+        self._log_buffer.clear()
         try:
             async with get_session() as session:
-                log = PlaybackLog(channel=channel, content=content, content_type=content_type)
-                session.add(log)
+                session.add_all(logs)
         except Exception:
             pass  # Don't fail on logging errors
 
+    async def run_playback_log_flusher(self) -> None:
+        """Background task: periodically flush buffered playback log rows."""
+        while True:
+            await asyncio.sleep(self.LOG_FLUSH_INTERVAL)
+            await self.flush_playback_log()
+
 
 def create_app(
     db_url: str = "sqlite+aiosqlite:///obs_harness.db",
@@ -450,19 +533,18 @@ def create_app(
         if persist:
             async with get_session() as session:
                 result = await session.execute(
-                    select(ConversationMessage)
+                    select(*CONVERSATION_MESSAGE_COLUMNS)
                     .where(ConversationMessage.character_name == character_name)
                     .order_by(ConversationMessage.created_at)
                 )
-                messages = list(result.scalars().all())
                 return [
                     {
-                        "role": m.role,
-                        "content": _parse_message_content(m.content),
-                        "interrupted": m.interrupted,
-                        "generated_text": m.generated_text,
+                        "role": role,
+                        "content": _parse_message_content(content),
+                        "interrupted": interrupted,
+                        "generated_text": generated_text,
                     }
-                    for m in messages
+                    for role, content, interrupted, generated_text in result
                 ]
         else:
             return conversation_memory.get(character_name, [])
@@ -474,11 +556,13 @@ def create_app(
         persist: bool,
         interrupted: bool = False,
         generated_text: str | None = None,
+        max_messages: int = 200,
     ) -> tuple[int, int | None]:
         """Save a conversation message. Returns (in-memory index, db_id or None).
 
         Content can be a string or a list (for multimodal messages with images).
-        Lists are JSON-serialized for database storage.
+        Lists are JSON-serialized for database storage. Persisted rows beyond
+        the newest max_messages (Character.memory_max_messages) are deleted.
         """
         # For database storage, serialize list content to JSON
         db_content = json.dumps(content) if isinstance(content, list) else content
@@ -500,6 +584,20 @@ def create_app(
                     generated_text=generated_text,
                 )
                 session.add(db_msg)
+                await session.flush()
+                # Trim to the newest rows so history (and startup load) stays bounded
+                newest_ids = (
+                    select(ConversationMessage.id)
+                    .where(ConversationMessage.character_name == character_name)
+                    .order_by(ConversationMessage.id.desc())
+                    .limit(max_messages)
+                )
+                await session.execute(
+                    delete(ConversationMessage).where(
+                        ConversationMessage.character_name == character_name,
+                        ConversationMessage.id.not_in(newest_ids),
+                    )
+                )
                 await session.commit()
                 await session.refresh(db_msg)
                 # Also keep in memory for current session
@@ -545,14 +643,11 @@ def create_app(
         # Clear from database if persisted
         if persist:
             async with get_session() as session:
-                result = await session.execute(
-                    select(ConversationMessage).where(
+                await session.execute(
+                    delete(ConversationMessage).where(
                         ConversationMessage.character_name == character_name
                     )
                 )
-                messages = list(result.scalars().all())
-                for msg in messages:
-                    await session.delete(msg)
                 await session.commit()
 
     async def load_persisted_memory_on_startup() -> None:
@@ -567,21 +662,21 @@ def create_app(
             for char in characters:
                 # Load their messages into memory
                 msg_result = await session.execute(
-                    select(ConversationMessage)
+                    select(*CONVERSATION_MESSAGE_COLUMNS)
                     .where(ConversationMessage.character_name == char.name)
                     .order_by(ConversationMessage.created_at)
                 )
-                messages = list(msg_result.scalars().all())
+                messages = [
+                    {
+                        "role": role,
+                        "content": content,
+                        "interrupted": interrupted,
+                        "generated_text": generated_text,
+                    }
+                    for role, content, interrupted, generated_text in msg_result
+                ]
                 if messages:
-                    conversation_memory[char.name] = [
-                        {
-                            "role": m.role,
-                            "content": m.content,
-                            "interrupted": m.interrupted,
-                            "generated_text": m.generated_text,
-                        }
-                        for m in messages
-                    ]
+                    conversation_memory[char.name] = messages
                     logger.info(f"Loaded {len(messages)} persisted messages for {char.name}")
 
     async def cancel_active_generation(name: str) -> str | None:
@@ -718,7 +813,7 @@ def create_app(
                 db_record.outcome = session_data.outcome
                 db_record.followup_count = session_data.followup_count
                 db_record.conversation_history = santa_manager.get_conversation_json()
-                db_record.ended_at = datetime.utcnow()
+                db_record.ended_at = utc_now()
                 await db_session.commit()
 
         # Get reward ID from config and re-enable
@@ -959,12 +1054,14 @@ def create_app(
         # Start background tasks
         ping_task = asyncio.create_task(ping_all_connections())
         reconnect_task = asyncio.create_task(eventsub_auto_reconnect())
+        log_flush_task = asyncio.create_task(harness.run_playback_log_flusher())
 
         yield
 
         # Cancel background tasks on shutdown
         ping_task.cancel()
         reconnect_task.cancel()
+        log_flush_task.cancel()
         try:
             await ping_task
         except asyncio.CancelledError:
@@ -973,9 +1070,18 @@ def create_app(
             await reconnect_task
         except asyncio.CancelledError:
             pass
+        try:
+            await log_flush_task
+        except asyncio.CancelledError:
+            pass
+        await harness.flush_playback_log()
 
         # Stop EventSub
         await eventsub_manager.stop()
+        if santa_manager:
+            await santa_manager.close()
+        await close_openrouter_clients()
+        await close_elevenlabs_clients()
         await close_db()
 
     app = FastAPI(
@@ -1299,7 +1405,7 @@ def create_app(
                 twitch_config.user_id = request.user_id
                 twitch_config.username = request.username
                 twitch_config.channel = request.channel
-                twitch_config.updated_at = datetime.utcnow()
+                twitch_config.updated_at = utc_now()
             else:
                 # Create new config
                 twitch_config = TwitchConfig(
@@ -1366,7 +1472,7 @@ def create_app(
 
             # Update channel
             twitch_config.channel = request.channel
-            twitch_config.updated_at = datetime.utcnow()
+            twitch_config.updated_at = utc_now()
             await session.commit()
 
             access_token = twitch_config.access_token
@@ -1471,49 +1577,20 @@ def create_app(
     # Character API Routes
     # =========================================================================
 
-    def _character_to_response(c: Character) -> CharacterResponse:
-        """Convert a Character model to CharacterResponse with connection status."""
-        return CharacterResponse(
-            id=c.id,
-            name=c.name,
-            description=c.description,
-            color=c.color,
-            icon=c.icon,
-            default_volume=c.default_volume,
-            mute_state=c.mute_state,
-            default_text_style=c.default_text_style,
-            text_font_family=c.text_font_family,
-            text_font_size=c.text_font_size,
-            text_color=c.text_color,
-            text_stroke_color=c.text_stroke_color,
-            text_stroke_width=c.text_stroke_width,
-            text_position_x=c.text_position_x,
-            text_position_y=c.text_position_y,
-            text_duration=c.text_duration,
-            elevenlabs_voice_id=c.elevenlabs_voice_id,
-            elevenlabs_model_id=c.elevenlabs_model_id,
-            voice_stability=c.voice_stability,
-            voice_similarity_boost=c.voice_similarity_boost,
-            voice_style=c.voice_style,
-            voice_speed=c.voice_speed,
-            system_prompt=c.system_prompt,
-            model=c.model,
-            provider=c.provider,
-            temperature=c.temperature,
-            max_tokens=c.max_tokens,
-            twitch_chat_enabled=c.twitch_chat_enabled,
-            twitch_chat_window_seconds=c.twitch_chat_window_seconds,
-            twitch_chat_max_messages=c.twitch_chat_max_messages,
-            memory_enabled=c.memory_enabled,
-            persist_memory=c.persist_memory,
-            tts_provider=c.tts_provider,
-            tts_settings=json.loads(c.tts_settings) if c.tts_settings else None,
-            connected=manager.is_connected(c.name),
-            playing=manager._channel_state.get(c.name, {}).get("playing", False),
-            streaming=manager._channel_state.get(c.name, {}).get("streaming", False),
-            created_at=c.created_at,
-            updated_at=c.updated_at,
-        )
+    def _character_to_response(row: Any) -> CharacterResponse:
+        """Build a CharacterResponse with connection status from a character row.
+
+        Expects a row selected with CHARACTER_RESPONSE_COLUMNS.
+        """
+        data = dict(row._mapping)
+        tts_settings = data["tts_settings"]
+        data["tts_settings"] = json.loads(tts_settings) if tts_settings else None
+        name = data["name"]
+        state = manager._channel_state.get(name, {})
+        data["connected"] = manager.is_connected(name)
+        data["playing"] = state.get("playing", False)
+        data["streaming"] = state.get("streaming", False)
+        return CharacterResponse.model_validate(data)
 
     # -------------------------------------------------------------------------
     # ElevenLabs API endpoints
@@ -1687,9 +1764,8 @@ def create_app(
     async def _broadcast_all_characters() -> None:
         """Fetch all characters from DB and broadcast to all dashboard clients."""
         async with get_session() as session:
-            result = await session.execute(select(Character))
-            characters = list(result.scalars().all())
-            char_dicts = [_character_to_response(c).model_dump() for c in characters]
+            result = await session.execute(select(*CHARACTER_RESPONSE_COLUMNS))
+            char_dicts = [_character_to_response(row).model_dump() for row in result]
             await manager.broadcast_character_sync(char_dicts)
 
     @app.post("/api/characters", status_code=201)
@@ -1721,26 +1797,33 @@ def create_app(
             await _broadcast_all_characters()
             return character
 
-    @app.get("/api/characters")
-    async def list_characters() -> list[CharacterResponse]:
+    @app.get("/api/characters", response_model=list[CharacterResponse])
+    async def list_characters() -> Response:
         """List all characters with connection status."""
         async with get_session() as session:
-            result = await session.execute(select(Character))
-            characters = list(result.scalars().all())
-            return [_character_to_response(c) for c in characters]
+            result = await session.execute(select(*CHARACTER_RESPONSE_COLUMNS))
+            characters = [_character_to_response(row) for row in result]
+        # Already validated - dump directly instead of FastAPI re-validating
+        return Response(
+            CHARACTER_LIST_ADAPTER.dump_json(characters),
+            media_type="application/json",
+        )
 
-    @app.get("/api/characters/{name}")
-    async def get_character(name: str) -> CharacterResponse:
+    @app.get("/api/characters/{name}", response_model=CharacterResponse)
+    async def get_character(name: str) -> Response:
         """Get a character by name."""
         async with get_session() as session:
             result = await session.execute(
-                select(Character).where(Character.name == name)
+                select(*CHARACTER_RESPONSE_COLUMNS).where(Character.name == name)
             )
-            character = result.scalar_one_or_none()
-            if not character:
-                raise HTTPException(status_code=404, detail="Character not found")
+            row = result.one_or_none()
+        if not row:
+            raise HTTPException(status_code=404, detail="Character not found")
 
-            return _character_to_response(character)
+        return Response(
+            _character_to_response(row).model_dump_json(),
+            media_type="application/json",
+        )
 
     @app.put("/api/characters/{name}")
     async def update_character(name: str, request: CharacterUpdate) -> Character:
@@ -1775,7 +1858,7 @@ def create_app(
                 update_data["tts_settings"] = json.dumps(update_data["tts_settings"])
             for key, value in update_data.items():
                 setattr(character, key, value)
-            character.updated_at = datetime.utcnow()
+            character.updated_at = utc_now()
 
             await session.commit()
             await session.refresh(character)
@@ -2075,20 +2158,14 @@ def create_app(
                 # Store twitch context if present
                 if twitch_chat_context:
                     await save_conversation_message(
-                        name, "context", twitch_chat_context, character.persist_memory
+                        name, "context", twitch_chat_context, character.persist_memory,
+                        max_messages=character.memory_max_messages,
                     )
                 # Build user content - multimodal if images present
-                if images:
-                    user_content: str | list = [{"type": "text", "text": request.message}]
-                    for img in images:
-                        user_content.append({
-                            "type": "image_url",
-                            "image_url": {"url": f"data:{img['media_type']};base64,{img['data']}"}
-                        })
-                else:
-                    user_content = request.message
+                user_content = pipeline_config.build_user_content(request.message)
                 await save_conversation_message(
-                    name, "user", user_content, character.persist_memory
+                    name, "user", user_content, character.persist_memory,
+                    max_messages=character.memory_max_messages,
                 )
 
                 # Check if we were cancelled (interrupted by stop button or new chat)
@@ -2103,13 +2180,15 @@ def create_app(
                             persist=character.persist_memory,
                             interrupted=True,
                             generated_text=response_text,  # Full LLM response for strikethrough
+                            max_messages=character.memory_max_messages,
                         )
                         # Track for browser update
                         pending_interrupted[name] = (msg_idx, character.persist_memory, db_id)
                 else:
                     # Normal completion - save full response
                     await save_conversation_message(
-                        name, "assistant", response_text, character.persist_memory
+                        name, "assistant", response_text, character.persist_memory,
+                        max_messages=character.memory_max_messages,
                     )
                     # Log the chat
                     await harness._log_playback(name, f"chat:{name}", "stream")
@@ -2239,7 +2318,7 @@ def create_app(
             update_data = request.model_dump(exclude_unset=True)
             for key, value in update_data.items():
                 setattr(config, key, value)
-            config.updated_at = datetime.utcnow()
+            config.updated_at = utc_now()
             await session.commit()
             await session.refresh(config)
 
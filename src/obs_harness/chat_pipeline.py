@@ -2,7 +2,7 @@
 
 import logging
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import AsyncIterator
 
 from .openrouter import OpenRouterClient
@@ -10,6 +10,9 @@ from .tts_pipeline import TTSStreamer
 
 logger = logging.getLogger(__name__)
 
+# Separator inserted between the system prompt and recent Twitch chat
+TWITCH_CONTEXT_HEADER = "\n\n---\nRecent Twitch chat (you can see what viewers are saying):\n"
+
 
 @dataclass
 class ChatPipelineConfig:
@@ -23,6 +26,26 @@ class ChatPipelineConfig:
     twitch_chat_context: str | None = None  # Recent Twitch chat to inject
     conversation_history: list[dict] | None = None  # Past messages for memory
     images: list[dict] | None = None  # Images for vision: [{data, media_type}]
+    # Short model name for logging, e.g. "claude-sonnet-4" from "anthropic/claude-sonnet-4"
+    model_short: str = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.model_short = self.model.split("/")[-1]
+
+        # Build image content blocks once - the base64 data URLs can be large
+        self._image_blocks: tuple[dict, ...] = tuple(
+            {
+                "type": "image_url",
+                "image_url": {"url": f"data:{img['media_type']};base64,{img['data']}"},
+            }
+            for img in self.images or ()
+        )
+
+    def build_user_content(self, user_message: str) -> str | list[dict]:
+        """Build user message content - multimodal if images present."""
+        if not self._image_blocks:
+            return user_message
+        return [{"type": "text", "text": user_message}, *self._image_blocks]
 
 
 class ChatPipeline:
@@ -58,18 +81,16 @@ class ChatPipeline:
         Returns:
             The complete response text from the LLM
         """
-        start_time = time.time()
-        msg_preview = user_message[:40] + "..." if len(user_message) > 40 else user_message
-        logger.debug(f"Pipeline starting - model={self.config.model}, message=\"{msg_preview}\"")
+        start_time = time.perf_counter()
+        if logger.isEnabledFor(logging.DEBUG):
+            msg_preview = user_message[:40] + "..." if len(user_message) > 40 else user_message
+            logger.debug('Pipeline starting - model=%s, message="%s"', self.config.model, msg_preview)
 
         # Build system prompt with optional Twitch chat context
         system_content = self.config.system_prompt
-        if self.config.twitch_chat_context:
-            system_content = f"""{self.config.system_prompt}
-
----
-Recent Twitch chat (you can see what viewers are saying):
-{self.config.twitch_chat_context}"""
+        twitch_context = self.config.twitch_chat_context
+        if twitch_context:
+            system_content = "".join((system_content, TWITCH_CONTEXT_HEADER, twitch_context))
 
         # Build messages with optional conversation history
         messages = [{"role": "system", "content": system_content}]
@@ -77,16 +98,7 @@ Recent Twitch chat (you can see what viewers are saying):
             messages.extend(self.config.conversation_history)
 
         # Build user message - multimodal if images present
-        if self.config.images:
-            content: list[dict] = [{"type": "text", "text": user_message}]
-            for img in self.config.images:
-                content.append({
-                    "type": "image_url",
-                    "image_url": {"url": f"data:{img['media_type']};base64,{img['data']}"}
-                })
-            messages.append({"role": "user", "content": content})
-        else:
-            messages.append({"role": "user", "content": user_message})
+        messages.append({"role": "user", "content": self.config.build_user_content(user_message)})
 
         # Create LLM client (kept alive to access usage after streaming)
         llm_client = OpenRouterClient()
@@ -109,22 +121,27 @@ Recent Twitch chat (you can see what viewers are saying):
             result = await self._tts_streamer.stream(llm_tokens())
 
             # Log with model, token usage, and cost
-            elapsed = time.time() - start_time
+            elapsed = time.perf_counter() - start_time
             usage = llm_client.last_usage
-            model_short = self.config.model.split("/")[-1]  # e.g., "claude-sonnet-4" from "anthropic/claude-sonnet-4"
+            model_short = self.config.model_short
 
             if usage:
                 cost_str = f"${usage.cost:.4f}" if usage.cost else "?"
-                tokens_str = f"{usage.prompt_tokens}+{usage.completion_tokens} tokens"
                 if self._cancelled:
-                    logger.info(f"LLM cancelled - {model_short} - {tokens_str} - {cost_str}")
+                    logger.info(
+                        "LLM cancelled - %s - %s+%s tokens - %s",
+                        model_short, usage.prompt_tokens, usage.completion_tokens, cost_str,
+                    )
                 else:
-                    logger.info(f"LLM complete - {model_short} - {tokens_str} - {cost_str} in {elapsed:.2f}s")
+                    logger.info(
+                        "LLM complete - %s - %s+%s tokens - %s in %.2fs",
+                        model_short, usage.prompt_tokens, usage.completion_tokens, cost_str, elapsed,
+                    )
             else:
                 if self._cancelled:
-                    logger.info(f"LLM cancelled - {model_short}")
+                    logger.info("LLM cancelled - %s", model_short)
                 else:
-                    logger.info(f"LLM complete - {model_short} - {len(result)} chars in {elapsed:.2f}s")
+                    logger.info("LLM complete - %s - %d chars in %.2fs", model_short, len(result), elapsed)
 
             return result
         finally:
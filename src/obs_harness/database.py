@@ -4,7 +4,7 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import AsyncGenerator
 
-from sqlalchemy import text
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
@@ -12,6 +12,25 @@ from sqlmodel import SQLModel
 # Global engine reference (set by init_db)
 _engine = None
 
+# Applied to every new SQLite connection. WAL + synchronous=NORMAL avoids an
+# fsync on every commit, which dominates when many short sessions commit.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Configure a freshly opened SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
 
 async def init_db(db_url: str = "sqlite+aiosqlite:///obs_harness.db") -> None:
     """Initialize the database engine and create tables."""
@@ -29,6 +48,9 @@ async def init_db(db_url: str = "sqlite+aiosqlite:///obs_harness.db") -> None:
         future=True,
     )
 
+    if db_url.startswith("sqlite"):
+        event.listen(_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
     async with _engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
 
@@ -38,6 +60,8 @@ async def init_db(db_url: str = "sqlite+aiosqlite:///obs_harness.db") -> None:
             # TTS provider abstraction migrations
             "ALTER TABLE character ADD COLUMN tts_provider TEXT DEFAULT 'elevenlabs'",
             "ALTER TABLE character ADD COLUMN tts_settings TEXT DEFAULT NULL",
+            # Per-character cap on persisted conversation memory
+            "ALTER TABLE character ADD COLUMN memory_max_messages INTEGER DEFAULT 200",
         ]
         for migration in migrations:
             try:
@@ -1,15 +1,42 @@
 """ElevenLabs TTS integration for OBS Harness."""
 
-import base64
 import json
 import os
+from binascii import a2b_base64
 from dataclasses import dataclass
 from typing import AsyncIterator
 
 import httpx
 
+from .tts.provider import word_spans
+
 ELEVENLABS_API_URL = "https://api.elevenlabs.io/v1"
 
+# Shared HTTP clients keyed by API key, so keep-alive connections (and their
+# TLS sessions) are reused across ElevenLabsClient instances
+_http_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def _get_http_client(api_key: str) -> httpx.AsyncClient:
+    """Get (or create) the shared HTTP client for an API key."""
+    client = _http_clients.get(api_key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=ELEVENLABS_API_URL,
+            headers={"xi-api-key": api_key},
+            timeout=30.0,
+        )
+        _http_clients[api_key] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close all shared ElevenLabs HTTP clients (call on app shutdown)."""
+    clients = list(_http_clients.values())
+    _http_clients.clear()
+    for client in clients:
+        await client.aclose()
+
 
 class ElevenLabsError(Exception):
     """Error from ElevenLabs API."""
@@ -17,7 +44,7 @@ class ElevenLabsError(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class WordTiming:
     """Timing information for a single word."""
 
@@ -26,7 +53,7 @@ class WordTiming:
     end_time: float
 
 
-@dataclass
+@dataclass(slots=True)
 class TTSChunkWithTiming:
     """A TTS audio chunk with optional word timing data."""
 
@@ -53,32 +80,17 @@ def parse_alignment_to_words(
         return []
 
     words = []
-    current_word = ""
-    word_start = None
-
-    for i, char in enumerate(characters):
-        if char.isspace():
-            # End of word
-            if current_word:
-                words.append(WordTiming(
-                    word=current_word,
-                    start_time=word_start,
-                    end_time=end_times[i - 1] if i > 0 else start_times[i],
-                ))
-                current_word = ""
-                word_start = None
+    last_index = len(characters)
+    for start, end in word_spans(characters):
+        if end == last_index:
+            # Last word runs to the end of the alignment
+            end_time = end_times[-1] if end_times else 0
         else:
-            # Part of a word
-            if word_start is None:
-                word_start = start_times[i]
-            current_word += char
-
-    # Don't forget the last word
-    if current_word:
+            end_time = end_times[end - 1]
         words.append(WordTiming(
-            word=current_word,
-            start_time=word_start,
-            end_time=end_times[-1] if end_times else 0,
+            word="".join(characters[start:end]),
+            start_time=start_times[start],
+            end_time=end_time,
         ))
 
     return words
@@ -102,11 +114,7 @@ class ElevenLabsClient:
             raise ValueError(
                 "ElevenLabs API key not provided. Set ELEVENLABS_API_KEY environment variable."
             )
-        self._client = httpx.AsyncClient(
-            base_url=ELEVENLABS_API_URL,
-            headers={"xi-api-key": self.api_key},
-            timeout=30.0,
-        )
+        self._client = _get_http_client(self.api_key)
 
     async def stream_tts(
         self,
@@ -114,6 +122,7 @@ class ElevenLabsClient:
         text: str,
         model_id: str = "eleven_multilingual_v2",
         output_format: str = "pcm_24000",
+        chunk_size: int = 4096,
     ) -> AsyncIterator[bytes]:
         """Stream TTS audio as PCM chunks.
 
@@ -122,6 +131,9 @@ class ElevenLabsClient:
             text: Text to convert to speech.
             model_id: ElevenLabs model to use.
             output_format: Audio output format (pcm_24000 for 24kHz 16-bit PCM).
+            chunk_size: Bytes per yielded chunk, rounded down to whole 16-bit
+                samples. Larger chunks mean fewer iterations but more audio
+                buffered before the first chunk (4096 bytes is ~85ms at 24kHz).
 
         Yields:
             Raw PCM audio bytes in chunks.
@@ -129,6 +141,8 @@ class ElevenLabsClient:
         Raises:
             ElevenLabsError: If the API request fails.
         """
+        chunk_size = max(2, chunk_size - chunk_size % 2)  # Keep PCM samples whole
+
         try:
             async with self._client.stream(
                 "POST",
@@ -146,7 +160,7 @@ class ElevenLabsClient:
                     raise ElevenLabsError(
                         f"ElevenLabs API error {response.status_code}: {error_text.decode()}"
                     )
-                async for chunk in response.aiter_bytes(chunk_size=4096):
+                async for chunk in response.aiter_bytes(chunk_size=chunk_size):
                     yield chunk
         except httpx.HTTPError as e:
             raise ElevenLabsError(f"HTTP error during TTS streaming: {e}") from e
@@ -207,14 +221,17 @@ class ElevenLabsClient:
                     )
 
                 # Response is newline-delimited JSON
-                buffer = ""
-                async for chunk in response.aiter_text():
+                # (json.loads accepts bytes, so skip decoding chunks to str).
+                # bytearray lets consumed lines be dropped in place instead of
+                # re-copying the remaining buffer for every line.
+                buffer = bytearray()
+                async for chunk in response.aiter_bytes():
                     buffer += chunk
 
                     # Process complete JSON objects
-                    while "\n" in buffer:
-                        line, buffer = buffer.split("\n", 1)
-                        line = line.strip()
+                    while (newline := buffer.find(b"\n")) >= 0:
+                        line = bytes(buffer[:newline]).strip()
+                        del buffer[:newline + 1]
                         if not line:
                             continue
 
@@ -225,7 +242,7 @@ class ElevenLabsClient:
 
                         # Extract audio (base64 encoded)
                         audio_b64 = data.get("audio_base64", "")
-                        audio_bytes = base64.b64decode(audio_b64) if audio_b64 else b""
+                        audio_bytes = a2b_base64(audio_b64) if audio_b64 else b""
 
                         # Extract alignment and convert to word timing
                         words = []
@@ -286,8 +303,11 @@ class ElevenLabsClient:
             raise ElevenLabsError(f"Failed to get models: {e}") from e
 
     async def close(self) -> None:
-        """Close the HTTP client."""
-        await self._client.aclose()
+        """Release the client.
+
+        The underlying HTTP client is shared and stays open so its pooled
+        connections can be reused; see close_http_clients().
+        """
 
     async def __aenter__(self) -> "ElevenLabsClient":
         """Async context manager entry."""
@@ -310,6 +330,6 @@ def estimate_tts_duration_ms(text: str, words_per_minute: int = 150) -> int:
     """
     word_count = len(text.split())
     # words / (words/min) = minutes -> * 60 * 1000 = milliseconds
-    duration_ms = int((word_count / words_per_minute) * 60 * 1000)
+    duration_ms = word_count * 60000 // words_per_minute
     # Minimum 1 second, maximum 5 minutes
     return max(1000, min(duration_ms, 300000))
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime
+from datetime import UTC, datetime
 from enum import Enum
 from typing import TYPE_CHECKING, Literal
 
@@ -20,6 +20,15 @@ if TYPE_CHECKING:
 # =============================================================================
 
 
+def utc_now() -> datetime:
+    """Current UTC time as a timezone-aware datetime.
+
+    Replaces datetime.utcnow(), which is deprecated and goes through the
+    warnings machinery on every call.
+    """
+    return datetime.now(UTC)
+
+
 class TextPreset(SQLModel, table=True):
     """A saved text animation preset."""
 
@@ -34,7 +43,7 @@ class TextPreset(SQLModel, table=True):
     position_x: float = SQLField(default=0.5)  # 0-1 normalized
     position_y: float = SQLField(default=0.5)  # 0-1 normalized
     duration: int = SQLField(default=3000)  # milliseconds
-    created_at: datetime = SQLField(default_factory=datetime.utcnow)
+    created_at: datetime = SQLField(default_factory=utc_now)
 
 
 class PlaybackLog(SQLModel, table=True):
@@ -44,7 +53,7 @@ class PlaybackLog(SQLModel, table=True):
     channel: str = SQLField(index=True)
     content: str  # filename or text content
     content_type: str  # "audio", "stream", "text"
-    timestamp: datetime = SQLField(default_factory=datetime.utcnow)
+    timestamp: datetime = SQLField(default_factory=utc_now)
 
 
 class TwitchConfig(SQLModel, table=True):
@@ -57,7 +66,7 @@ class TwitchConfig(SQLModel, table=True):
     username: str | None = SQLField(default=None)  # Logged-in user's username
     # Chat - which channel to read chat from (can be different from logged-in user)
     channel: str  # Channel to join for chat (without #)
-    updated_at: datetime = SQLField(default_factory=datetime.utcnow)
+    updated_at: datetime = SQLField(default_factory=utc_now)
 
 
 class ConversationMessage(SQLModel, table=True):
@@ -69,7 +78,7 @@ class ConversationMessage(SQLModel, table=True):
     content: str  # The message content
     interrupted: bool = SQLField(default=False)  # Was this message interrupted?
     generated_text: str | None = SQLField(default=None)  # Full text if interrupted
-    created_at: datetime = SQLField(default_factory=datetime.utcnow)
+    created_at: datetime = SQLField(default_factory=utc_now)
 
 
 class Character(SQLModel, table=True):
@@ -125,8 +134,9 @@ class Character(SQLModel, table=True):
     # Conversation memory settings
     memory_enabled: bool = SQLField(default=False)
     persist_memory: bool = SQLField(default=False)  # Save memory through restarts
+    memory_max_messages: int = SQLField(default=200)  # Persisted rows kept (oldest trimmed)
 
-    created_at: datetime = SQLField(default_factory=datetime.utcnow)
+    created_at: datetime = SQLField(default_factory=utc_now)
     updated_at: datetime | None = SQLField(default=None)
 
 
@@ -257,6 +267,7 @@ class CharacterCreate(BaseModel):
     # Conversation memory settings
     memory_enabled: bool = False
     persist_memory: bool = False
+    memory_max_messages: int = Field(default=200, ge=10, le=10000)
 
 
 class CharacterUpdate(BaseModel):
@@ -310,6 +321,7 @@ class CharacterUpdate(BaseModel):
     # Conversation memory settings
     memory_enabled: bool | None = None
     persist_memory: bool | None = None
+    memory_max_messages: int | None = Field(default=None, ge=10, le=10000)
 
     # Optimistic concurrency control
     expected_updated_at: datetime | None = None  # If provided, update fails if record was modified
@@ -368,6 +380,7 @@ class CharacterResponse(BaseModel):
     # Conversation memory settings
     memory_enabled: bool
     persist_memory: bool
+    memory_max_messages: int
 
     # Status
     connected: bool = False
@@ -432,7 +445,21 @@ class WSEvent(str, Enum):
     ERROR = "error"
 
 
-class PlayCommand(BaseModel):
+class ServerCommand(BaseModel):
+    """Base for commands sent from server to browser."""
+
+    @classmethod
+    def build(cls, **kwargs):
+        """Build a command from trusted, already-validated values.
+
+        Skips validation (model_construct) - only for server-generated
+        payloads whose values came from typed code or validated requests.
+        Browser input must still go through normal validation.
+        """
+        return cls.model_construct(**kwargs)
+
+
+class PlayCommand(ServerCommand):
     """WebSocket command to play audio."""
 
     action: Literal["play"] = "play"
@@ -441,20 +468,20 @@ class PlayCommand(BaseModel):
     loop: bool = False
 
 
-class StopCommand(BaseModel):
+class StopCommand(ServerCommand):
     """WebSocket command to stop audio."""
 
     action: Literal["stop"] = "stop"
 
 
-class VolumeCommand(BaseModel):
+class VolumeCommand(ServerCommand):
     """WebSocket command to set volume."""
 
     action: Literal["volume"] = "volume"
     level: float
 
 
-class StreamStartCommand(BaseModel):
+class StreamStartCommand(ServerCommand):
     """WebSocket command to start audio stream."""
 
     action: Literal["stream_start"] = "stream_start"
@@ -463,19 +490,19 @@ class StreamStartCommand(BaseModel):
     format: str = "pcm16"
 
 
-class StreamEndCommand(BaseModel):
+class StreamEndCommand(ServerCommand):
     """WebSocket command to end audio stream."""
 
     action: Literal["stream_end"] = "stream_end"
 
 
-class StopStreamCommand(BaseModel):
+class StopStreamCommand(ServerCommand):
     """WebSocket command to forcefully stop audio stream and clear playback."""
 
     action: Literal["stop_stream"] = "stop_stream"
 
 
-class TextCommand(BaseModel):
+class TextCommand(ServerCommand):
     """WebSocket command to display text."""
 
     action: Literal["text"] = "text"
@@ -491,13 +518,13 @@ class TextCommand(BaseModel):
     stroke_width: int = 0
 
 
-class ClearTextCommand(BaseModel):
+class ClearTextCommand(ServerCommand):
     """WebSocket command to clear text overlay."""
 
     action: Literal["clear_text"] = "clear_text"
 
 
-class TextStreamStartCommand(BaseModel):
+class TextStreamStartCommand(ServerCommand):
     """WebSocket command to start streaming text display."""
 
     action: Literal["text_stream_start"] = "text_stream_start"
@@ -511,32 +538,41 @@ class TextStreamStartCommand(BaseModel):
     instant_reveal: bool = False  # If True, show all text immediately
 
 
-class TextChunkCommand(BaseModel):
+class TextChunkCommand(ServerCommand):
     """WebSocket command to send a text chunk for streaming display."""
 
     action: Literal["text_chunk"] = "text_chunk"
     text: str
 
 
-class TextStreamEndCommand(BaseModel):
+class TextStreamEndCommand(ServerCommand):
     """WebSocket command to end streaming text display."""
 
     action: Literal["text_stream_end"] = "text_stream_end"
 
 
 class WordTimingItem(BaseModel):
-    """A single word with timing information."""
+    """A single word with timing information.
+
+    Deprecated: word_timing now sends parallel arrays (see WordTimingCommand).
+    """
 
     word: str
     start: float  # seconds from audio start
     end: float
 
 
-class WordTimingCommand(BaseModel):
-    """WebSocket command to send word timing data for synced text reveal."""
+class WordTimingCommand(ServerCommand):
+    """WebSocket command to send word timing data for synced text reveal.
+
+    Columnar layout - words[i] plays from starts[i] to ends[i] - so keys
+    aren't repeated per word on the wire.
+    """
 
     action: Literal["word_timing"] = "word_timing"
-    words: list[WordTimingItem]
+    words: list[str]
+    starts: list[float]  # seconds from audio start
+    ends: list[float]
 
 
 class BrowserEvent(BaseModel):
@@ -646,7 +682,7 @@ class SantaConfig(SQLModel, table=True):
     max_followups: int = SQLField(default=2)
     response_timeout_seconds: int = SQLField(default=60)
     debounce_seconds: int = SQLField(default=4)  # Wait for additional messages
-    updated_at: datetime = SQLField(default_factory=datetime.utcnow)
+    updated_at: datetime = SQLField(default_factory=utc_now)
 
 
 class SantaSession(SQLModel, table=True):
@@ -661,7 +697,7 @@ class SantaSession(SQLModel, table=True):
     followup_count: int = SQLField(default=0)
     outcome: str | None = SQLField(default=None)  # grant, deny, cancelled, timeout
     conversation_history: str = SQLField(default="[]")  # JSON array of messages
-    started_at: datetime = SQLField(default_factory=datetime.utcnow)
+    started_at: datetime = SQLField(default_factory=utc_now)
     ended_at: datetime | None = SQLField(default=None)
 
 
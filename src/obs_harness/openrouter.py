@@ -4,11 +4,16 @@ import asyncio
 import json
 import logging
 import os
+import random
+import time
+from contextlib import aclosing
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import AsyncIterator
+from urllib.parse import urlsplit
+from urllib.request import getproxies_environment, proxy_bypass_environment
 
 import httpx
-from httpx_sse import aconnect_sse
 
 logger = logging.getLogger(__name__)
 
@@ -23,17 +28,211 @@ class StreamUsage:
 
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1"
 
+# Terminal SSE data sentinel, checked before any JSON parsing
+SSE_DONE = b"[DONE]"
+
 # Transient HTTP errors worth retrying
-RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Error codes in an in-band error payload worth retrying
+RETRYABLE_ERROR_CODES = frozenset({"rate_limit_exceeded", "server_error"})
+
+# Longest server-requested Retry-After we'll wait for before retrying
+MAX_RETRY_AFTER = 30.0  # seconds
+
+# Shared HTTP clients keyed by API key, so keep-alive connections (and their
+# TLS sessions) are reused across OpenRouterClient instances
+_http_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def _env_proxy() -> str | None:
+    """Proxy URL for OpenRouter from HTTPS_PROXY/ALL_PROXY, honouring NO_PROXY.
+
+    A custom transport disables httpx's own environment proxy lookup, so the
+    proxy is resolved here and passed to the transport explicitly.
+    """
+    proxies = getproxies_environment()
+    proxy = proxies.get("https") or proxies.get("all")
+    if not proxy or proxy_bypass_environment(urlsplit(OPENROUTER_API_URL).hostname, proxies):
+        return None
+    return proxy
+
+
+def _get_http_client(api_key: str) -> httpx.AsyncClient:
+    """Get (or create) the shared HTTP client for an API key."""
+    client = _http_clients.get(api_key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=OPENROUTER_API_URL,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            timeout=120.0,  # LLM responses can be slow
+            transport=httpx.AsyncHTTPTransport(
+                # Failed connection attempts are retried here, without
+                # re-entering the request-level retry loop
+                retries=2,
+                # Keep idle connections longer than httpx's 5s default so chats
+                # a few seconds apart still reuse the warm TLS connection
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=30.0,
+                ),
+                proxy=_env_proxy(),
+            ),
+        )
+        _http_clients[api_key] = client
+    return client
+
+
+# Model catalog lookups change rarely - cache successful results for an hour
+CATALOG_CACHE_TTL = 3600.0  # seconds
+_catalog_cache: dict[str, tuple[float, list]] = {}  # key -> (expires_at, value)
+
+
+def _get_cached_catalog(key: str) -> list | None:
+    """Get a cached catalog result if it hasn't expired."""
+    entry = _catalog_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if time.monotonic() >= expires_at:
+        del _catalog_cache[key]
+        return None
+    return value
+
+
+def _set_cached_catalog(key: str, value: list) -> None:
+    """Cache a catalog result (empty results are never cached)."""
+    if value:
+        _catalog_cache[key] = (time.monotonic() + CATALOG_CACHE_TTL, value)
+
+
+async def _iter_sse_data(response: httpx.Response) -> AsyncIterator[bytes]:
+    """Yield the data payload of each server-sent event as raw bytes.
+
+    A minimal SSE scanner for OpenRouter's stream: only data: fields are
+    kept (multi-line data is joined with newlines), comment lines such as
+    keep-alives are skipped, and event/id/retry fields are ignored.
+    """
+    buffer = bytearray()
+    data_lines: list[bytes] = []
+    async for chunk in response.aiter_bytes():
+        buffer += chunk
+        while (newline := buffer.find(b"\n")) >= 0:
+            line = bytes(buffer[:newline]).rstrip(b"\r")
+            del buffer[:newline + 1]
+
+            if not line:
+                # Blank line ends the event
+                if data_lines:
+                    yield data_lines[0] if len(data_lines) == 1 else b"\n".join(data_lines)
+                    data_lines = []
+            elif line.startswith(b"data:"):
+                value = line[5:]
+                data_lines.append(value[1:] if value.startswith(b" ") else value)
+            # Anything else is a comment (":") or a field we don't use
+
+
+# Reusable compact encoder for request bodies (same output httpx's json=
+# produces, but the body can be encoded once and reused across retries)
+_encode_json = json.JSONEncoder(
+    separators=(",", ":"), ensure_ascii=False, allow_nan=False
+).encode
+
+
+@lru_cache(maxsize=32)
+def _base_payload(
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    provider_order: tuple[str, ...] | None,
+    stream: bool,
+) -> dict:
+    """Build the request fields that only depend on character config.
+
+    Cached per config - callers must copy it, never mutate it.
+    """
+    payload = {
+        "model": model,
+        "stream": stream,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "usage": {"include": True},  # Get cost in response
+    }
+
+    # Add provider routing if specified
+    if provider_order:
+        payload["provider"] = {
+            "order": list(provider_order),
+            "allow_fallbacks": False,  # Strict provider selection
+        }
+
+    return payload
+
+
+def _build_request_body(
+    messages: list[dict],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    provider: str | list[str] | None,
+    stream: bool,
+    response_format: dict | None = None,
+) -> bytes:
+    """Serialize a chat completion request body."""
+    if provider:
+        provider_order = (provider,) if isinstance(provider, str) else tuple(provider)
+    else:
+        provider_order = None
+
+    payload = {
+        **_base_payload(model, temperature, max_tokens, provider_order, stream),
+        "messages": messages,
+    }
+
+    # Add response format for structured outputs
+    if response_format:
+        payload["response_format"] = response_format
+
+    return _encode_json(payload).encode()
+
+
+async def close_http_clients() -> None:
+    """Close all shared OpenRouter HTTP clients (call on app shutdown)."""
+    clients = list(_http_clients.values())
+    _http_clients.clear()
+    for client in clients:
+        await client.aclose()
 
 
 class OpenRouterError(Exception):
     """Error from OpenRouter API."""
 
-    def __init__(self, message: str, status_code: int | None = None, retryable: bool = False):
+    def __init__(
+        self,
+        message: str,
+        status_code: int | None = None,
+        retryable: bool = False,
+        retry_after: float | None = None,
+    ):
         super().__init__(message)
         self.status_code = status_code
         self.retryable = retryable
+        self.retry_after = retry_after  # Server-requested delay in seconds
+
+
+def _parse_retry_after(response: httpx.Response) -> float | None:
+    """Get the Retry-After delay in seconds (delta-seconds form only)."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None  # HTTP-date form - fall back to our own backoff
 
 
 class OpenRouterClient:
@@ -51,16 +250,19 @@ class OpenRouterClient:
 
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        # Exponential backoff delay before each retry, indexed by failed attempt
+        self._delays = tuple(retry_delay * (1 << i) for i in range(max_retries))
         self.last_usage: StreamUsage | None = None  # Populated after streaming
 
-        self._client = httpx.AsyncClient(
-            base_url=OPENROUTER_API_URL,
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            },
-            timeout=120.0,  # LLM responses can be slow
-        )
+        self._http_client: httpx.AsyncClient | None = None  # Looked up on first request
+
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        """The shared HTTP client for this API key, created on first use."""
+        client = self._http_client
+        if client is None or client.is_closed:
+            client = self._http_client = _get_http_client(self.api_key)
+        return client
 
     async def stream_chat(
         self,
@@ -88,93 +290,85 @@ class OpenRouterClient:
         Raises:
             OpenRouterError: If the API request fails after retries.
         """
-        last_error = None
+        # Serialize once - retries resend the same body
+        body = _build_request_body(
+            messages, model, temperature, max_tokens, provider, stream=True
+        )
 
         for attempt in range(self.max_retries):
             try:
-                async for token in self._stream_chat_attempt(
-                    messages, model, temperature, max_tokens, provider
-                ):
+                async for token in self._stream_chat_attempt(body):
                     yield token
                 return  # Success, exit retry loop
+            except (OpenRouterError, httpx.HTTPError) as e:
+                await self._retry_or_raise(attempt, e)
 
-            except OpenRouterError as e:
-                last_error = e
-                if not e.retryable or attempt == self.max_retries - 1:
-                    raise
-
-                delay = self.retry_delay * (2 ** attempt)  # Exponential backoff
-                logger.warning(f"OpenRouter error (attempt {attempt + 1}): {e}, retrying in {delay}s...")
-                await asyncio.sleep(delay)
-
-            except httpx.HTTPError as e:
-                last_error = OpenRouterError(f"HTTP error: {e}", retryable=True)
-                if attempt == self.max_retries - 1:
-                    raise last_error
-
-                delay = self.retry_delay * (2 ** attempt)
-                logger.warning(f"OpenRouter HTTP error (attempt {attempt + 1}): {e}, retrying in {delay}s...")
-                await asyncio.sleep(delay)
-
-        if last_error:
-            raise last_error
+    async def _retry_or_raise(
+        self, attempt: int, error: OpenRouterError | httpx.HTTPError
+    ) -> None:
+        """Handle a failed attempt: raise if final, otherwise back off.
 
-    async def _stream_chat_attempt(
-        self,
-        messages: list[dict],
-        model: str,
-        temperature: float,
-        max_tokens: int,
-        provider: str | list[str] | None = None,
-    ) -> AsyncIterator[str]:
+        HTTP transport errors are wrapped as retryable OpenRouterErrors.
+        Must be called from the except block handling the error.
+        """
+        if isinstance(error, httpx.HTTPError):
+            wrapped = OpenRouterError(f"HTTP error: {error}", retryable=True)
+            label = "OpenRouter HTTP error"
+        else:
+            wrapped = error
+            label = "OpenRouter error"
+
+        if not wrapped.retryable or attempt == self.max_retries - 1:
+            raise wrapped
+
+        # Equal jitter keeps concurrent sessions from retrying in lockstep
+        delay = self._delays[attempt] * (0.5 + random.random() / 2)
+        if wrapped.retry_after is not None:
+            delay = max(delay, min(wrapped.retry_after, MAX_RETRY_AFTER))
+        logger.warning(f"{label} (attempt {attempt + 1}): {error}, retrying in {delay:.2f}s...")
+        await asyncio.sleep(delay)
+
+    async def _stream_chat_attempt(self, body: bytes) -> AsyncIterator[str]:
         """Single attempt at streaming chat completion."""
-        # Build request payload
-        payload = {
-            "model": model,
-            "messages": messages,
-            "stream": True,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-            "usage": {"include": True},  # Get cost in response
-        }
-
-        # Add provider routing if specified
-        if provider:
-            provider_order = [provider] if isinstance(provider, str) else provider
-            payload["provider"] = {
-                "order": provider_order,
-                "allow_fallbacks": False,  # Strict provider selection
-            }
-
-        async with aconnect_sse(
-            self._client,
+        async with self._client.stream(
             "POST",
             "/chat/completions",
-            json=payload,
-        ) as event_source:
+            content=body,
+            headers={"Accept": "text/event-stream"},
+        ) as response:
             # Check response status
-            if event_source.response.status_code != 200:
-                status = event_source.response.status_code
+            if response.status_code != 200:
+                status = response.status_code
                 retryable = status in RETRYABLE_STATUS_CODES
                 raise OpenRouterError(
                     f"API returned status {status}",
                     status_code=status,
                     retryable=retryable,
+                    retry_after=_parse_retry_after(response),
                 )
 
-            async for event in event_source.aiter_sse():
-                if event.data == "[DONE]":
-                    break
-                if event.data.startswith(":"):
-                    continue  # OpenRouter keep-alive comment
+            loads = json.loads
+            async with aclosing(_iter_sse_data(response)) as events:
+                async for event_data in events:
+                    # Chat deltas are JSON objects - one prefix test covers the
+                    # common case; everything else is [DONE] or ignorable
+                    if not event_data.startswith(b"{"):
+                        if event_data == SSE_DONE:
+                            break
+                        continue
+
+                    try:
+                        data = loads(event_data)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        # A truncated or garbled event is a real protocol problem
+                        logger.warning("Malformed OpenRouter SSE event: %r", event_data[:200])
+                        continue
 
-                try:
-                    data = json.loads(event.data)
                     if "error" in data:
                         error_msg = data["error"].get("message", "Unknown error")
                         error_code = data["error"].get("code")
                         # Rate limits and server errors are retryable
-                        retryable = error_code in ("rate_limit_exceeded", "server_error")
+                        retryable = error_code in RETRYABLE_ERROR_CODES
                         raise OpenRouterError(error_msg, retryable=retryable)
 
                     # Capture usage from final chunk (OpenRouter includes it in last event)
@@ -187,12 +381,15 @@ class OpenRouterClient:
                             cost=usage.get("cost"),  # USD cost
                         )
 
-                    delta = data.get("choices", [{}])[0].get("delta", {})
-                    content = delta.get("content")
-                    if content:
-                        yield content
-                except json.JSONDecodeError:
-                    continue
+                    # Walk choices[0].delta.content without building fallback
+                    # dicts (the usage-only final chunk may have no choices)
+                    choices = data.get("choices")
+                    if choices:
+                        delta = choices[0].get("delta")
+                        if delta:
+                            content = delta.get("content")
+                            if content:
+                                yield content
 
     async def chat(
         self,
@@ -228,67 +425,23 @@ class OpenRouterClient:
         Raises:
             OpenRouterError: If the API request fails after retries.
         """
-        last_error = None
+        # Serialize once - retries resend the same body
+        body = _build_request_body(
+            messages, model, temperature, max_tokens, provider,
+            stream=False, response_format=response_format,
+        )
 
         for attempt in range(self.max_retries):
             try:
-                return await self._chat_attempt(
-                    messages, model, temperature, max_tokens, provider, response_format
-                )
-            except OpenRouterError as e:
-                last_error = e
-                if not e.retryable or attempt == self.max_retries - 1:
-                    raise
-
-                delay = self.retry_delay * (2 ** attempt)
-                logger.warning(f"OpenRouter error (attempt {attempt + 1}): {e}, retrying in {delay}s...")
-                await asyncio.sleep(delay)
-
-            except httpx.HTTPError as e:
-                last_error = OpenRouterError(f"HTTP error: {e}", retryable=True)
-                if attempt == self.max_retries - 1:
-                    raise last_error
-
-                delay = self.retry_delay * (2 ** attempt)
-                logger.warning(f"OpenRouter HTTP error (attempt {attempt + 1}): {e}, retrying in {delay}s...")
-                await asyncio.sleep(delay)
-
-        if last_error:
-            raise last_error
+                return await self._chat_attempt(body)
+            except (OpenRouterError, httpx.HTTPError) as e:
+                await self._retry_or_raise(attempt, e)
+
         raise OpenRouterError("Unknown error in chat()")
 
-    async def _chat_attempt(
-        self,
-        messages: list[dict],
-        model: str,
-        temperature: float,
-        max_tokens: int,
-        provider: str | list[str] | None,
-        response_format: dict | None,
-    ) -> str:
+    async def _chat_attempt(self, body: bytes) -> str:
         """Single attempt at non-streaming chat completion."""
-        payload = {
-            "model": model,
-            "messages": messages,
-            "stream": False,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-            "usage": {"include": True},
-        }
-
-        # Add provider routing if specified
-        if provider:
-            provider_order = [provider] if isinstance(provider, str) else provider
-            payload["provider"] = {
-                "order": provider_order,
-                "allow_fallbacks": False,
-            }
-
-        # Add response format for structured outputs
-        if response_format:
-            payload["response_format"] = response_format
-
-        response = await self._client.post("/chat/completions", json=payload)
+        response = await self._client.post("/chat/completions", content=body)
 
         if response.status_code != 200:
             status = response.status_code
@@ -297,6 +450,7 @@ class OpenRouterClient:
                 f"API returned status {status}",
                 status_code=status,
                 retryable=retryable,
+                retry_after=_parse_retry_after(response),
             )
 
         data = response.json()
@@ -305,7 +459,7 @@ class OpenRouterClient:
         if "error" in data:
             error_msg = data["error"].get("message", "Unknown error")
             error_code = data["error"].get("code")
-            retryable = error_code in ("rate_limit_exceeded", "server_error")
+            retryable = error_code in RETRYABLE_ERROR_CODES
             raise OpenRouterError(error_msg, retryable=retryable)
 
         # Capture usage
@@ -335,6 +489,11 @@ class OpenRouterClient:
         Returns:
             List of provider names that can serve this model.
         """
+        cache_key = f"providers:{model}"
+        cached = _get_cached_catalog(cache_key)
+        if cached is not None:
+            return list(cached)
+
         try:
             response = await self._client.get(f"/models/{model}")
             if response.status_code != 200:
@@ -348,7 +507,8 @@ class OpenRouterClient:
                 provider = endpoint.get("provider_name") or endpoint.get("name")
                 if provider and provider not in providers:
                     providers.append(provider)
-            return providers
+            _set_cached_catalog(cache_key, providers)
+            return list(providers)
 
         except Exception:
             return []
@@ -359,20 +519,29 @@ class OpenRouterClient:
         Returns:
             List of model info dictionaries.
         """
+        cached = _get_cached_catalog("models")
+        if cached is not None:
+            return list(cached)
+
         try:
             response = await self._client.get("/models")
             if response.status_code != 200:
                 return []
 
             data = response.json()
-            return data.get("data", [])
+            models = data.get("data", [])
+            _set_cached_catalog("models", models)
+            return list(models)
 
         except Exception:
             return []
 
     async def close(self) -> None:
-        """Close the HTTP client."""
-        await self._client.aclose()
+        """Release the client.
+
+        The underlying HTTP client is shared and stays open so its pooled
+        connections can be reused; see close_http_clients().
+        """
 
     async def __aenter__(self) -> "OpenRouterClient":
         return self
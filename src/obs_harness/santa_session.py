@@ -10,11 +10,15 @@ Handles the multi-turn conversation flow for the Mall Santa feature:
 import asyncio
 import json
 import logging
+import os
+import re
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING, Callable, Awaitable
 
+import httpx
+
 from .openrouter import OpenRouterClient
 
 if TYPE_CHECKING:
@@ -30,6 +34,9 @@ logger = logging.getLogger(__name__)
 
 SANTA_MODEL = "moonshotai/kimi-k2-0905"
 
+# Santa speaks through this server's own character speak endpoint
+SPEAK_API_BASE_URL = "http://localhost:8080"
+
 SANTA_SYSTEM_PROMPT = """You are Timmy, a jolly mall penguin Santa with magical wish-granting powers!
 
 OUTPUT FORMAT (JSON):
@@ -50,6 +57,16 @@ FLOW:
 
 You remember everything from this stream. Reference past visitors, chat's previous judgments, wishes granted or denied. Chat is your elf council."""
 
+# Fallback for replies that wrap the JSON object in other text (e.g. markdown)
+_JSON_OBJECT_RE = re.compile(r'\{[^{}]*\}')
+
+# Most recent conversation turns (user + assistant pairs) sent to the LLM;
+# the opening wish is always kept so Santa knows what is being judged
+SANTA_MAX_TURNS = 20
+
+# Leading system message, identical for every turn
+SANTA_SYSTEM_MESSAGE = {"role": "system", "content": SANTA_SYSTEM_PROMPT}
+
 SANTA_RESPONSE_FORMAT = {
     "type": "json_schema",
     "json_schema": {
@@ -86,7 +103,7 @@ class SantaState(str, Enum):
     COMPLETE = "complete"
 
 
-@dataclass
+@dataclass(slots=True)
 class SantaResponse:
     """Parsed response from Santa LLM."""
 
@@ -115,6 +132,21 @@ class SessionData:
 # =============================================================================
 
 
+def _trim_history(history: list[dict], max_turns: int = SANTA_MAX_TURNS) -> list[dict]:
+    """Keep the opening wish plus the most recent turns of a conversation.
+
+    A tail that would start on a user message is shortened by one, so the
+    wish is never followed by two user messages in a row.
+    """
+    max_entries = 2 * max_turns
+    if len(history) <= max_entries:
+        return history
+    tail = history[-(max_entries - 1):]
+    if tail[0]["role"] == "user":
+        tail = tail[1:]
+    return [history[0], *tail]
+
+
 class SantaSessionManager:
     """Manages Santa Timmy wish sessions.
 
@@ -154,6 +186,32 @@ class SantaSessionManager:
         # Callbacks for state updates (for WebSocket broadcasting)
         self._on_state_change: Callable[[SessionData], Awaitable[None]] | None = None
 
+        # LLM client reused for every turn (its HTTP pool is shared process-wide)
+        self._llm_client: OpenRouterClient | None = None
+
+        # HTTP client for the local speak endpoint, kept open so each utterance
+        # reuses a pooled connection instead of building a new client
+        self._http = httpx.AsyncClient(
+            base_url=SPEAK_API_BASE_URL,
+            timeout=60.0,
+            limits=httpx.Limits(max_keepalive_connections=4),
+        )
+
+        # Optional provider pinning (e.g. "Moonshot AI,Groq") so every turn of a
+        # session hits the same backend and its prompt cache
+        provider_env = os.environ.get("SANTA_PROVIDER_ORDER", "")
+        self._provider_order = [p.strip() for p in provider_env.split(",") if p.strip()] or None
+
+    def _get_llm_client(self) -> OpenRouterClient:
+        """Get the LLM client, creating it on first use."""
+        if self._llm_client is None:
+            self._llm_client = OpenRouterClient()
+        return self._llm_client
+
+    async def close(self) -> None:
+        """Release the speak HTTP client (call on app shutdown)."""
+        await self._http.aclose()
+
     @property
     def active_session(self) -> SessionData | None:
         """Get the current active session."""
@@ -273,7 +331,7 @@ class SantaSessionManager:
         # Only accept messages from the redeemer during ASK_FOLLOWUP
         if self._session.state == SantaState.ASK_FOLLOWUP:
             if user_id == self._session.redeemer_user_id:
-                await self._message_queue.put((user_id, username, message))
+                self._message_queue.put_nowait((user_id, username, message))
 
     async def force_verdict(self, verdict: str) -> bool:
         """Force a grant/deny verdict from dashboard - immediately stops session.
@@ -337,7 +395,7 @@ class SantaSessionManager:
         """
         try:
             # Use LLM to generate a response
-            llm_client = OpenRouterClient()
+            llm_client = self._get_llm_client()
 
             # Build a simple conversation for the interruption
             system_prompt = await self._get_system_prompt()
@@ -399,22 +457,24 @@ class SantaSessionManager:
         self._session.conversation.append({"role": "user", "content": user_message})
 
         # Build messages for LLM
-        messages = [{"role": "system", "content": SANTA_SYSTEM_PROMPT}]
-        messages.extend(self._session.conversation)
+        # (only role/content go to the LLM - the parsed_* fields kept on
+        # assistant turns for the dashboard would just duplicate content)
+        messages = [SANTA_SYSTEM_MESSAGE]
+        messages.extend(
+            {"role": m["role"], "content": m["content"]}
+            for m in _trim_history(self._session.conversation)
+        )
 
         # Call LLM (non-streaming with JSON schema)
         try:
-            client = OpenRouterClient()
-            try:
-                response_text = await client.chat(
-                    messages=messages,
-                    model=SANTA_MODEL,
-                    temperature=0.8,
-                    max_tokens=512,
-                    response_format=SANTA_RESPONSE_FORMAT,
-                )
-            finally:
-                await client.close()
+            response_text = await self._get_llm_client().chat(
+                messages=messages,
+                model=SANTA_MODEL,
+                temperature=0.8,
+                max_tokens=512,
+                provider=self._provider_order,
+                response_format=SANTA_RESPONSE_FORMAT,
+            )
 
             # Parse JSON response
             santa_response = self._parse_response(response_text)
@@ -465,8 +525,7 @@ class SantaSessionManager:
             pass
 
         # Try to extract JSON from text (may be wrapped in markdown)
-        import re
-        json_match = re.search(r'\{[^{}]*\}', text, re.DOTALL)
+        json_match = _JSON_OBJECT_RE.search(text)
         if json_match:
             try:
                 data = json.loads(json_match.group())
@@ -529,19 +588,16 @@ class SantaSessionManager:
         """
         async with self._speech_lock:
             try:
-                import httpx
                 start_time = asyncio.get_event_loop().time()
                 logger.info(f"Santa speaking: {text[:50]}...")
 
-                async with httpx.AsyncClient() as client:
-                    response = await client.post(
-                        f"http://localhost:8080/api/characters/{self.character_name}/speak",
-                        json={"text": text},
-                        timeout=60.0,
-                    )
-                    if response.status_code != 200:
-                        logger.error(f"TTS speak failed: {response.text}")
-                        return
+                response = await self._http.post(
+                    f"/api/characters/{self.character_name}/speak",
+                    json={"text": text},
+                )
+                if response.status_code != 200:
+                    logger.error(f"TTS speak failed: {response.text}")
+                    return
 
                 # Wait for actual stream completion from browser
                 completed = await self.harness.wait_for_stream_complete(
@@ -1,22 +1,26 @@
 """Cartesia WebSocket TTS streaming integration."""
 
 import asyncio
-import base64
 import json
 import logging
 import os
 import uuid
+from binascii import a2b_base64
 from typing import AsyncIterator
 
 import websockets
 
-from .provider import AudioChunkWithTiming, WordTiming
+from .provider import AudioChunkQueue, AudioChunkWithTiming, WordTiming
 
 logger = logging.getLogger(__name__)
 
 CARTESIA_WS_URL = "wss://api.cartesia.ai/tts/websocket"
 CARTESIA_VERSION = "2024-06-10"
 
+# Reusable compact encoder for outgoing messages (json.dumps with custom
+# options would construct a new encoder on every call)
+_encode_json = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
 
 class CartesiaWSError(Exception):
     """Error from Cartesia WebSocket API."""
@@ -62,7 +66,7 @@ class CartesiaWSClient:
 
         self._ws = None
         self._receive_task = None
-        self._chunk_queue: asyncio.Queue[AudioChunkWithTiming | None] = asyncio.Queue()
+        self._chunk_queue = AudioChunkQueue()
         self._context_id: str | None = None
         self._closed = False
         self._input_ended = False
@@ -103,6 +107,8 @@ class CartesiaWSClient:
                     ping_interval=20,
                     ping_timeout=10,
                     close_timeout=5,
+                    # Frames are mostly base64 PCM - deflate costs CPU for little gain
+                    compression=None,
                 )
                 self._receive_task = asyncio.create_task(self._receive_loop())
                 return
@@ -174,8 +180,11 @@ class CartesiaWSClient:
         if self._input_ended:
             raise CartesiaWSError("Input already ended. Cannot send more text.")
 
+        if not text and not flush:
+            return  # Nothing to synthesize
+
         message = self._build_message(text, is_final=flush)
-        await self._ws.send(json.dumps(message))
+        await self._ws.send(_encode_json(message))
 
     async def close_input(self) -> None:
         """Signal end of input by sending final message with continue=False."""
@@ -183,7 +192,7 @@ class CartesiaWSClient:
             self._input_ended = True
             # Send empty transcript with continue=False to finalize
             message = self._build_message("", is_final=True)
-            await self._ws.send(json.dumps(message))
+            await self._ws.send(_encode_json(message))
 
     async def _receive_loop(self) -> None:
         """Background task to receive audio from WebSocket."""
@@ -207,14 +216,14 @@ class CartesiaWSClient:
                     # Audio chunk
                     audio_b64 = data.get("data", "")
                     if audio_b64:
-                        audio_bytes = base64.b64decode(audio_b64)
+                        audio_bytes = a2b_base64(audio_b64)
                         pending_audio.append(audio_bytes)
 
                         # Emit chunk if we have audio (even without timing yet)
                         # This keeps audio flowing with low latency
                         if pending_audio and not pending_words:
                             audio = b"".join(pending_audio)
-                            await self._chunk_queue.put(AudioChunkWithTiming(
+                            self._chunk_queue.put_nowait(AudioChunkWithTiming(
                                 audio=audio,
                                 words=[],
                             ))
@@ -237,7 +246,7 @@ class CartesiaWSClient:
                     # Emit chunk with accumulated audio and words
                     if pending_audio or pending_words:
                         audio = b"".join(pending_audio)
-                        await self._chunk_queue.put(AudioChunkWithTiming(
+                        self._chunk_queue.put_nowait(AudioChunkWithTiming(
                             audio=audio,
                             words=pending_words,
                         ))
@@ -248,24 +257,24 @@ class CartesiaWSClient:
                     # Generation complete
                     # Flush any remaining audio
                     if pending_audio or pending_words:
-                        await self._chunk_queue.put(AudioChunkWithTiming(
+                        self._chunk_queue.put_nowait(AudioChunkWithTiming(
                             audio=b"".join(pending_audio),
                             words=pending_words,
                         ))
-                    await self._chunk_queue.put(None)  # Signal end
+                    self._chunk_queue.put_nowait(None)  # Signal end
                     break
 
                 elif msg_type == "error":
                     error_msg = data.get("message", "Unknown error")
                     error_code = data.get("code", "unknown")
                     logger.error(f"Cartesia error [{error_code}]: {error_msg}")
-                    await self._chunk_queue.put(None)
+                    self._chunk_queue.put_nowait(None)
                     raise CartesiaWSError(f"[{error_code}] {error_msg}")
 
         except websockets.exceptions.ConnectionClosed:
-            await self._chunk_queue.put(None)
+            self._chunk_queue.put_nowait(None)
         except Exception as e:
-            await self._chunk_queue.put(None)
+            self._chunk_queue.put_nowait(None)
             if not self._closed:
                 raise CartesiaWSError(f"Receive error: {e}")
 
@@ -273,11 +282,22 @@ class CartesiaWSClient:
         """Iterate over received audio chunks (audio only, no timing).
 
         Yields:
-            PCM audio bytes as they are received.
+            PCM audio bytes as they are received. Chunks that arrived
+            together are joined so each wake-up yields once.
         """
-        async for chunk in self.iter_audio_with_timing():
-            if chunk.audio:
-                yield chunk.audio
+        while True:
+            audio = []
+            ended = False
+            for chunk in await self._chunk_queue.get_batch():
+                if chunk is None:
+                    ended = True
+                    break
+                if chunk.audio:
+                    audio.append(chunk.audio)
+            if audio:
+                yield b"".join(audio)
+            if ended:
+                return
 
     async def iter_audio_with_timing(self) -> AsyncIterator[AudioChunkWithTiming]:
         """Iterate over audio chunks with timing.
@@ -1,21 +1,36 @@
 """ElevenLabs WebSocket TTS streaming integration."""
 
 import asyncio
-import base64
 import json
 import logging
 import os
+import re
+from binascii import a2b_base64
 from dataclasses import dataclass
 from typing import AsyncIterator
 
 import websockets
 
-from .provider import AudioChunkWithTiming, WordTiming
+from .provider import AudioChunkQueue, AudioChunkWithTiming, WordTiming, word_spans
 
 logger = logging.getLogger(__name__)
 
 ELEVENLABS_WS_URL = "wss://api.elevenlabs.io/v1/text-to-speech"
 
+# Reusable compact encoder for outgoing messages (json.dumps with custom
+# options would construct a new encoder on every call)
+_encode_json = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+# Fixed parts of the send_text envelope - only the text itself is encoded per send
+_TEXT_PREFIX = '{"text":'
+_TEXT_SUFFIX = ',"try_trigger_generation":true}'
+_TEXT_FLUSH_SUFFIX = ',"try_trigger_generation":true,"flush":true}'
+_EOS_MESSAGE = '{"text":""}'  # Empty text signals end of input
+
+# LLM tokens arriving within this window are joined into a single send -
+# ElevenLabs buffers text per its chunk_length_schedule anyway
+TEXT_COALESCE_SECONDS = 0.025
+
 
 class ElevenLabsWSError(Exception):
     """Error from ElevenLabs WebSocket API."""
@@ -23,7 +38,7 @@ class ElevenLabsWSError(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class ParseResult:
     """Result from parsing alignment with potential incomplete word."""
 
@@ -31,6 +46,10 @@ class ParseResult:
     pending: dict | None  # Incomplete word at end: {"word": str, "start_ms": int, "end_ms": int}
 
 
+# Any alphanumeric character (\w without underscore, same set as str.isalnum)
+_ALNUM_RE = re.compile(r"[^\W_]")
+
+
 def parse_alignment_to_words(
     chars: list[str],
     start_times_ms: list[int],
@@ -57,19 +76,19 @@ def parse_alignment_to_words(
         return ParseResult(words=[], pending=pending_word)
 
     words = []
-    current_word = ""
-    word_start_ms = None
-    word_end_ms = None
+    spans = word_spans(chars)
+    n_durations = len(durations_ms)
 
     # Check if first char continues a word from previous chunk
-    first_char_continues_word = not chars[0].isspace() if chars else False
+    first_char_continues_word = not chars[0].isspace()
 
-    # If we have a pending word and first char continues it, start with pending
+    # If we have a pending word and first char continues it, merge it into
+    # the first word of this chunk
+    prefix = ""
+    prefix_start_ms = None
     if pending_word and first_char_continues_word:
-        current_word = pending_word["word"]
-        word_start_ms = pending_word["start_ms"]
-        word_end_ms = pending_word["end_ms"]
-        pending_word = None  # Consumed
+        prefix = pending_word["word"]
+        prefix_start_ms = pending_word["start_ms"]
     elif pending_word:
         # Pending word is complete (next chunk starts with space/new word)
         words.append(WordTiming(
@@ -77,54 +96,38 @@ def parse_alignment_to_words(
             start_time=pending_word["start_ms"] / 1000.0,
             end_time=pending_word["end_ms"] / 1000.0,
         ))
-        pending_word = None
-
-    for i, char in enumerate(chars):
-        if char.isspace():
-            # End of word - save if we have one
-            if current_word and word_start_ms is not None:
-                words.append(WordTiming(
-                    word=current_word,
-                    start_time=word_start_ms / 1000.0,
-                    end_time=word_end_ms / 1000.0,
-                ))
-                current_word = ""
-                word_start_ms = None
-                word_end_ms = None
+
+    # Words are runs of non-space chars (letters, numbers, or punctuation)
+    new_pending = None
+    last = len(spans) - 1
+    for n, (start, end) in enumerate(spans):
+        word = "".join(chars[start:end])
+        word_start_ms = start_times_ms[start]
+        word_end_ms = start_times_ms[end - 1] + (durations_ms[end - 1] if end - 1 < n_durations else 0)
+        if n == 0 and prefix:
+            word = prefix + word
+            word_start_ms = prefix_start_ms
+
+        if n == last and end == len(chars):
+            # Chunk ends mid-word (no trailing space) - this word might
+            # continue in the next chunk, so mark it as pending
+            new_pending = {
+                "word": word,
+                "start_ms": word_start_ms,
+                "end_ms": word_end_ms,
+            }
         else:
-            # Part of a word (letters, numbers, or punctuation)
-            if word_start_ms is None:
-                word_start_ms = start_times_ms[i]
-            current_word += char
-            # Update end time to include this character
-            word_end_ms = start_times_ms[i] + (durations_ms[i] if i < len(durations_ms) else 0)
-
-    # Check if chunk ends mid-word (no trailing space)
-    ends_mid_word = current_word and (not chars or not chars[-1].isspace())
-
-    if ends_mid_word and current_word and word_start_ms is not None:
-        # This word might continue in the next chunk - mark as pending
-        new_pending = {
-            "word": current_word,
-            "start_ms": word_start_ms,
-            "end_ms": word_end_ms,
-        }
-        return ParseResult(
-            words=[w for w in words if any(c.isalnum() for c in w.word)],
-            pending=new_pending,
-        )
-    elif current_word and word_start_ms is not None:
-        # Word ended with the chunk (trailing space) - it's complete
-        words.append(WordTiming(
-            word=current_word,
-            start_time=word_start_ms / 1000.0,
-            end_time=word_end_ms / 1000.0,
-        ))
+            words.append(WordTiming(
+                word=word,
+                start_time=word_start_ms / 1000.0,
+                end_time=word_end_ms / 1000.0,
+            ))
 
     # Filter out punctuation-only "words" (e.g., standalone "!" or "?")
-    words = [w for w in words if any(c.isalnum() for c in w.word)]
+    has_alnum = _ALNUM_RE.search
+    words = [w for w in words if has_alnum(w.word)]
 
-    return ParseResult(words=words, pending=None)
+    return ParseResult(words=words, pending=new_pending)
 
 
 class ElevenLabsWSClient:
@@ -151,8 +154,13 @@ class ElevenLabsWSClient:
         self.output_format = output_format
         self.sync_alignment = sync_alignment
         self._ws = None
+        self._send = None  # Bound self._ws.send, cached for per-token sends
+        self._pending_text: list[str] = []  # Text waiting for the coalesce window
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task | None = None  # At most one in-flight timer send
+        self._send_error: BaseException | None = None  # First failed timer send
         self._receive_task = None
-        self._chunk_queue: asyncio.Queue[AudioChunkWithTiming | None] = asyncio.Queue()
+        self._chunk_queue = AudioChunkQueue()
         self._initialized = False
         self._closed = False
         # Buffer for incomplete word at chunk boundary
@@ -192,6 +200,24 @@ class ElevenLabsWSClient:
         """
         last_error = None
 
+        # Initialization message (BOS - Beginning of Stream), serialized once
+        # and reused across retry attempts
+        init_message = _encode_json({
+            "text": " ",  # Required initial text (space is minimal)
+            "voice_settings": {
+                "stability": stability,
+                "similarity_boost": similarity_boost,
+                "style": style,
+                "speed": speed,
+            },
+            "generation_config": {
+                # Chunk length schedule determines buffering before generation
+                # Lower values = lower latency but potentially lower quality
+                "chunk_length_schedule": [120, 160, 250, 290],
+            },
+            "xi-api-key": self.api_key,
+        })
+
         for attempt in range(max_retries):
             try:
                 # Reset pending word state on new connection
@@ -202,25 +228,12 @@ class ElevenLabsWSClient:
                     ping_interval=20,
                     ping_timeout=10,
                     close_timeout=5,
+                    # Frames are mostly base64 PCM - deflate costs CPU for little gain
+                    compression=None,
                 )
 
-                # Send initialization message (BOS - Beginning of Stream)
-                init_message = {
-                    "text": " ",  # Required initial text (space is minimal)
-                    "voice_settings": {
-                        "stability": stability,
-                        "similarity_boost": similarity_boost,
-                        "style": style,
-                        "speed": speed,
-                    },
-                    "generation_config": {
-                        # Chunk length schedule determines buffering before generation
-                        # Lower values = lower latency but potentially lower quality
-                        "chunk_length_schedule": [120, 160, 250, 290],
-                    },
-                    "xi-api-key": self.api_key,
-                }
-                await self._ws.send(json.dumps(init_message))
+                await self._ws.send(init_message)
+                self._send = self._ws.send
                 self._initialized = True
 
                 # Start background receiver task
@@ -245,12 +258,17 @@ class ElevenLabsWSClient:
 
     async def _receive_loop(self) -> None:
         """Background task to receive audio chunks from WebSocket."""
+        # Bind per-frame lookups to locals
+        queue_put = self._chunk_queue.put_nowait
+        loads = json.loads
+        debug = logger.isEnabledFor(logging.DEBUG)
+
         try:
             async for message in self._ws:
                 if self._closed:
                     break
 
-                data = json.loads(message)
+                data = loads(message)
 
                 # Check for final message
                 if data.get("isFinal"):
@@ -262,19 +280,19 @@ class ElevenLabsWSClient:
                             end_time=self._pending_word["end_ms"] / 1000.0,
                         )
                         # Only emit if it has alphanumeric content
-                        if any(c.isalnum() for c in final_word.word):
+                        if _ALNUM_RE.search(final_word.word):
                             logger.debug(f"Final pending word: {final_word.word}")
-                            await self._chunk_queue.put(AudioChunkWithTiming(
+                            queue_put(AudioChunkWithTiming(
                                 audio=b"",
                                 words=[final_word],
                             ))
                         self._pending_word = None
-                    await self._chunk_queue.put(None)  # Signal end
+                    queue_put(None)  # Signal end
                     break
 
                 # Extract audio data (base64 encoded)
                 audio_b64 = data.get("audio")
-                audio_bytes = base64.b64decode(audio_b64) if audio_b64 else b""
+                audio_bytes = a2b_base64(audio_b64) if audio_b64 else b""
 
                 # Extract alignment data if present
                 words = []
@@ -283,47 +301,106 @@ class ElevenLabsWSClient:
                     chars = alignment.get("chars", [])
                     start_times = alignment.get("charStartTimesMs", [])
                     durations = alignment.get("charDurationsMs", [])
-                    logger.debug(f"Alignment: chars={''.join(chars)}, start_times={start_times[:5]}...")
+                    if debug:
+                        logger.debug(f"Alignment: chars={''.join(chars)}, start_times={start_times[:5]}...")
                     if chars and start_times:
                         result = parse_alignment_to_words(chars, start_times, durations, self._pending_word)
                         words = result.words
                         self._pending_word = result.pending
-                        if result.pending:
-                            logger.debug(f"Pending word buffered: '{result.pending['word']}'")
-                        logger.debug(f"Parsed words: {[(w.word, w.start_time) for w in words]}")
+                        if debug:
+                            if result.pending:
+                                logger.debug(f"Pending word buffered: '{result.pending['word']}'")
+                            logger.debug(f"Parsed words: {[(w.word, w.start_time) for w in words]}")
 
                 if audio_bytes or words:
-                    await self._chunk_queue.put(AudioChunkWithTiming(
+                    queue_put(AudioChunkWithTiming(
                         audio=audio_bytes,
                         words=words,
                     ))
 
         except websockets.exceptions.ConnectionClosed:
             # Connection closed, signal end
-            await self._chunk_queue.put(None)
+            queue_put(None)
         except Exception as e:
-            await self._chunk_queue.put(None)
+            queue_put(None)
             if not self._closed:
                 raise ElevenLabsWSError(f"Receive error: {e}")
 
     async def send_text(self, text: str, flush: bool = False) -> None:
         """Send text chunk to be converted to speech.
 
+        Text is held for up to TEXT_COALESCE_SECONDS so bursts of small LLM
+        tokens go out as one message.
+
         Args:
             text: Text to convert to speech
-            flush: If True, forces generation of buffered text
+            flush: If True, sends pending text now and forces generation
         """
         if not self._initialized:
             raise ElevenLabsWSError("Not connected. Call connect() first.")
+        self._raise_send_error()
+
+        if text:
+            # Never send empty text on its own - ElevenLabs treats it as EOS
+            self._pending_text.append(text)
 
-        message = {
-            "text": text,
-            "try_trigger_generation": True,
-        }
         if flush:
-            message["flush"] = True
+            await self._await_flush_task()
+            await self._send_pending(flush=True)
+        elif self._pending_text and self._flush_handle is None:
+            self._arm_coalesce_timer()
+
+    def _arm_coalesce_timer(self) -> None:
+        """Schedule a send of pending text at the end of the coalesce window."""
+        self._flush_handle = asyncio.get_running_loop().call_later(
+            TEXT_COALESCE_SECONDS, self._on_coalesce_timer
+        )
 
-        await self._ws.send(json.dumps(message))
+    def _on_coalesce_timer(self) -> None:
+        """Timer callback: send text collected during the coalesce window."""
+        self._flush_handle = None
+        if not self._pending_text or self._closed or self._send_error:
+            return
+        if self._flush_task and not self._flush_task.done():
+            # Previous send still in flight - keep order, retry next window
+            self._arm_coalesce_timer()
+            return
+        self._flush_task = asyncio.create_task(self._send_pending())
+        self._flush_task.add_done_callback(self._on_flush_done)
+
+    def _on_flush_done(self, task: asyncio.Task) -> None:
+        """Record the first error from a timer-driven send."""
+        if not task.cancelled() and task.exception() and self._send_error is None:
+            self._send_error = task.exception()
+
+    def _raise_send_error(self) -> None:
+        """Re-raise a failed timer-driven send to the caller."""
+        if self._send_error is not None:
+            raise ElevenLabsWSError(f"Send error: {self._send_error}") from self._send_error
+
+    async def _await_flush_task(self) -> None:
+        """Wait for an in-flight timer send, raising its error if it failed."""
+        if self._flush_task:
+            await asyncio.wait((self._flush_task,))
+            self._flush_task = None
+        self._raise_send_error()
+
+    async def _send_pending(self, flush: bool = False) -> None:
+        """Send all pending text as a single message."""
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending_text:
+            if flush:
+                # Nothing buffered - still send the flush frame so ElevenLabs
+                # generates the text it is holding
+                await self._send(_TEXT_PREFIX + '""' + _TEXT_FLUSH_SUFFIX)
+            return
+
+        text = "".join(self._pending_text)
+        self._pending_text.clear()
+        suffix = _TEXT_FLUSH_SUFFIX if flush else _TEXT_SUFFIX
+        await self._send(_TEXT_PREFIX + _encode_json(text) + suffix)
 
     async def close_input(self) -> None:
         """Signal end of text input (EOS - End of Stream).
@@ -332,18 +409,33 @@ class ElevenLabsWSClient:
         will finish generating any remaining audio.
         """
         if self._ws and self._initialized:
+            # Finish any timer-driven send (surfacing its error), then send
+            # anything still in the coalesce window
+            await self._await_flush_task()
+            await self._send_pending()
             # Send empty text to signal end of input
-            await self._ws.send(json.dumps({"text": ""}))
+            await self._ws.send(_EOS_MESSAGE)
 
     async def iter_audio(self) -> AsyncIterator[bytes]:
         """Iterate over received audio chunks (audio only, no timing).
 
         Yields:
-            PCM audio bytes as they are received.
+            PCM audio bytes as they are received. Chunks that arrived
+            together are joined so each wake-up yields once.
         """
-        async for chunk in self.iter_audio_with_timing():
-            if chunk.audio:
-                yield chunk.audio
+        while True:
+            audio = []
+            ended = False
+            for chunk in await self._chunk_queue.get_batch():
+                if chunk is None:
+                    ended = True
+                    break
+                if chunk.audio:
+                    audio.append(chunk.audio)
+            if audio:
+                yield b"".join(audio)
+            if ended:
+                return
 
     async def iter_audio_with_timing(self) -> AsyncIterator[AudioChunkWithTiming]:
         """Iterate over received audio chunks with word timing.
@@ -361,6 +453,13 @@ class ElevenLabsWSClient:
         """Close WebSocket connection and cleanup."""
         self._closed = True
 
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending_text.clear()
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+
         if self._receive_task:
             self._receive_task.cancel()
             try:
@@ -5,6 +5,9 @@ allowing the system to swap between ElevenLabs, Cartesia, and
 future providers.
 """
 
+import asyncio
+import re
+from collections import deque
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Protocol, AsyncIterator
@@ -24,7 +27,7 @@ class TTSProviderType(str, Enum):
 # -----------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class WordTiming:
     """Timing information for a single word."""
 
@@ -33,7 +36,7 @@ class WordTiming:
     end_time: float
 
 
-@dataclass
+@dataclass(slots=True)
 class AudioChunkWithTiming:
     """Audio chunk with optional word timing."""
 
@@ -41,6 +44,58 @@ class AudioChunkWithTiming:
     words: list[WordTiming]
 
 
+class AudioChunkQueue:
+    """Single-producer, single-consumer chunk queue for receive loops.
+
+    A deque plus an Event: unlike asyncio.Queue, getting a chunk that is
+    already buffered doesn't allocate a waiter future. ``None`` is used by
+    clients as the end-of-stream sentinel.
+    """
+
+    def __init__(self) -> None:
+        self._items: deque[AudioChunkWithTiming | None] = deque()
+        self._ready = asyncio.Event()
+
+    def put_nowait(self, chunk: AudioChunkWithTiming | None) -> None:
+        """Append a chunk and wake the consumer."""
+        self._items.append(chunk)
+        self._ready.set()
+
+    async def get(self) -> AudioChunkWithTiming | None:
+        """Get the next chunk, waiting only if none is buffered."""
+        items = self._items
+        while not items:
+            self._ready.clear()
+            await self._ready.wait()
+        return items.popleft()
+
+    async def get_batch(self) -> list[AudioChunkWithTiming | None]:
+        """Get every buffered chunk at once, waiting only if none is buffered."""
+        items = self._items
+        while not items:
+            self._ready.clear()
+            await self._ready.wait()
+        batch = list(items)
+        items.clear()
+        return batch
+
+
+# Runs of non-whitespace characters (words, including attached punctuation)
+_WORD_RE = re.compile(r"\S+")
+
+
+def word_spans(chars: list[str]) -> list[tuple[int, int]]:
+    """Find (start, end) index spans of words in a list of characters.
+
+    Scans the joined string with a regex instead of looping per character.
+    """
+    text = "".join(chars)
+    if len(text) != len(chars):
+        # Some entries aren't single characters - scan a 1:1 whitespace mask
+        text = "".join([" " if c.isspace() else "x" for c in chars])
+    return [m.span() for m in _WORD_RE.finditer(text)]
+
+
 # -----------------------------------------------------------------------------
 # Provider settings schemas (for JSON blob validation)
 # -----------------------------------------------------------------------------
@@ -9,6 +9,7 @@ from typing import Any, AsyncIterator, Awaitable, Callable, Union
 from .tts import (
     TTSProviderType,
     TTSProviderClient,
+    WordTiming,
     create_tts_client,
     get_connect_kwargs,
 )
@@ -17,6 +18,12 @@ from .tts.cartesia_ws import CartesiaWSError
 
 logger = logging.getLogger(__name__)
 
+# Error raised when a provider's stream ends before all text was sent
+_PROVIDER_ERRORS: dict[TTSProviderType, type[Exception]] = {
+    TTSProviderType.ELEVENLABS: ElevenLabsWSError,
+    TTSProviderType.CARTESIA: CartesiaWSError,
+}
+
 
 @dataclass
 class TTSStreamConfig:
@@ -93,7 +100,7 @@ class TTSStreamer:
         send_audio_start: Callable[[], Awaitable[bool]],
         send_audio_chunk: Callable[[bytes], Awaitable[bool]],
         send_audio_end: Callable[[], Awaitable[bool]],
-        send_word_timing: Callable[[list[dict]], Awaitable[bool]],
+        send_word_timing: Callable[[list[WordTiming]], Awaitable[bool]],
     ) -> None:
         """Initialize the TTS streamer.
 
@@ -134,7 +141,9 @@ class TTSStreamer:
             The complete text that was spoken
 
         Raises:
-            ElevenLabsWSError: If TTS connection or streaming fails
+            ElevenLabsWSError / CartesiaWSError: If TTS connection or streaming
+                fails, including the provider disconnecting before all text
+                was sent
         """
         start_time = time.time()
         settings = self._tts_config.get_settings()
@@ -179,19 +188,38 @@ class TTSStreamer:
                     await self._tts_client.send_text(text_source)
                     full_text = text_source
                 else:
-                    full_text = ""
+                    # Collect tokens and join once at the end (avoids
+                    # repeated string reallocation on long responses)
+                    parts: list[str] = []
+                    receive_task = self._receive_task
                     async for token in text_source:
-                        if self._cancelled:
+                        # Stop feeding TTS once the receiver has exited - its
+                        # exception (if any) is re-raised when awaited below
+                        if self._cancelled or receive_task.done():
                             break
-                        full_text += token
+                        parts.append(token)
                         await self._tts_client.send_text(token)
+                    full_text = "".join(parts)
 
                 # 6. Close TTS input and wait for audio to finish
                 if not self._cancelled:
-                    await self._tts_client.close_input()
-                    await self._receive_task
+                    if self._receive_task.done():
+                        # Receiver exited before the input was closed: re-raise
+                        # its error, or report the disconnect it swallowed
+                        await self._receive_task
+                        if not self._cancelled:
+                            error_cls = _PROVIDER_ERRORS.get(
+                                self._tts_config.provider, ElevenLabsWSError
+                            )
+                            raise error_cls("TTS stream ended before input was complete")
+                    else:
+                        await self._tts_client.close_input()
+                        await self._receive_task
 
             finally:
+                # Don't leave the receiver running if sending failed
+                if self._receive_task and not self._receive_task.done():
+                    self._receive_task.cancel()
                 await self._tts_client.close()
                 self._tts_client = None
                 self._receive_task = None
@@ -228,29 +256,25 @@ class TTSStreamer:
         Args:
             tts_client: The TTS provider WebSocket client
         """
+        show_text = self._show_text
+        send_word_timing = self._send_word_timing
+
         try:
             async for chunk in tts_client.iter_audio_with_timing():
                 if self._cancelled:
                     break
 
                 # Send word timing BEFORE audio so browser can sync
-                if chunk.words:
+                words = chunk.words
+                if words:
                     # Accumulate spoken text (what was actually converted to audio)
-                    for w in chunk.words:
-                        if self._spoken_text and not self._spoken_text.endswith(" "):
-                            self._spoken_text += " "
-                        self._spoken_text += w.word
-
-                    if self._show_text:
-                        words_data = [
-                            {
-                                "word": w.word,
-                                "start": w.start_time,
-                                "end": w.end_time,
-                            }
-                            for w in chunk.words
-                        ]
-                        await self._send_word_timing(words_data)
+                    chunk_text = " ".join([w.word for w in words])
+                    if self._spoken_text and not self._spoken_text.endswith(" "):
+                        self._spoken_text += " "
+                    self._spoken_text += chunk_text
+
+                    if show_text:
+                        await send_word_timing(words)
 
                 # Send audio to browser
                 if chunk.audio:
@@ -594,15 +594,28 @@ console.log('[channel.js] VERSION 12 LOADED - bidirectional heartbeat + max reco
         wordTimingEnabled = true;
 
         // Append words to our timing data
-        for (const word of msg.words) {
-            wordTimingData.push({
-                word: word.word,
-                start: word.start,
-                end: word.end
-            });
+        const firstNew = wordTimingData.length;
+        if (msg.starts) {
+            // Columnar format: parallel words/starts/ends arrays
+            for (let i = 0; i < msg.words.length; i++) {
+                wordTimingData.push({
+                    word: msg.words[i],
+                    start: msg.starts[i],
+                    end: msg.ends[i]
+                });
+            }
+        } else {
+            // Legacy format: list of {word, start, end} objects
+            for (const word of msg.words) {
+                wordTimingData.push({
+                    word: word.word,
+                    start: word.start,
+                    end: word.end
+                });
+            }
         }
 
-        console.log(`[${channelName}] Word timing received: ${msg.words.map(w => `"${w.word}"@${w.start.toFixed(2)}s`).join(', ')} (total: ${wordTimingData.length})`);
+        console.log(`[${channelName}] Word timing received: ${wordTimingData.slice(firstNew).map(w => `"${w.word}"@${w.start.toFixed(2)}s`).join(', ')} (total: ${wordTimingData.length})`);
     }
 
     function endTextStream() {
@@ -0,0 +1,81 @@
+"""Tests for ElevenLabsWSClient text coalescing."""
+
+import asyncio
+import json
+
+import pytest
+
+from obs_harness.tts.elevenlabs_ws import TEXT_COALESCE_SECONDS, ElevenLabsWSClient, ElevenLabsWSError
+
+
+class FakeWebSocket:
+    """Records sent frames; optionally fails the Nth send."""
+
+    def __init__(self, fail_on: int | None = None) -> None:
+        self.sent: list[dict] = []
+        self.fail_on = fail_on
+
+    async def send(self, message: str) -> None:
+        await asyncio.sleep(0)
+        if self.fail_on is not None and len(self.sent) + 1 == self.fail_on:
+            self.fail_on = None
+            raise ConnectionError("socket closed")
+        self.sent.append(json.loads(message))
+
+    async def close(self) -> None:
+        pass
+
+
+def _make_client(ws: FakeWebSocket) -> ElevenLabsWSClient:
+    client = ElevenLabsWSClient(voice_id="voice", api_key="key")
+    client._ws = ws
+    client._send = ws.send
+    client._initialized = True
+    return client
+
+
+def _window() -> asyncio.Future:
+    return asyncio.sleep(TEXT_COALESCE_SECONDS * 3)
+
+
+def test_tokens_in_window_are_sent_together():
+    async def run() -> list[dict]:
+        ws = FakeWebSocket()
+        client = _make_client(ws)
+        for token in ("Hello", " there", " friend"):
+            await client.send_text(token)
+        await _window()
+        await client.close_input()
+        return ws.sent
+
+    sent = asyncio.run(run())
+    assert [frame["text"] for frame in sent] == ["Hello there friend", ""]
+
+
+def test_flush_with_empty_buffer_sends_flush_frame():
+    async def run() -> list[dict]:
+        ws = FakeWebSocket()
+        client = _make_client(ws)
+        await client.send_text("", flush=True)
+        return ws.sent
+
+    assert asyncio.run(run()) == [{"text": "", "try_trigger_generation": True, "flush": True}]
+
+
+def test_failed_timer_send_is_raised_to_caller():
+    async def run() -> None:
+        ws = FakeWebSocket(fail_on=1)
+        client = _make_client(ws)
+        await client.send_text("Hello")
+        await _window()
+        try:
+            with pytest.raises(ElevenLabsWSError, match="socket closed"):
+                await client.send_text(" there")
+            with pytest.raises(ElevenLabsWSError, match="socket closed"):
+                await client.close_input()
+        finally:
+            await client.close()
+        # Nothing after the failed window (including EOS) was sent
+        assert ws.sent == []
+
+    asyncio.run(run())
@@ -0,0 +1,31 @@
+"""Tests for Santa conversation history trimming."""
+
+from obs_harness.santa_session import _trim_history
+
+
+def _conversation(turns: int) -> list[dict]:
+    """Alternating user/assistant history ending on a new user message."""
+    history = []
+    for i in range(turns):
+        history.append({"role": "user", "content": f"user {i}"})
+        history.append({"role": "assistant", "content": f"santa {i}"})
+    history.append({"role": "user", "content": "latest"})
+    return history
+
+
+def test_short_history_is_unchanged():
+    history = _conversation(3)
+    assert _trim_history(history, max_turns=5) is history
+
+
+def test_trimmed_history_keeps_wish_and_alternates_roles():
+    history = _conversation(30)
+
+    trimmed = _trim_history(history, max_turns=5)
+
+    roles = [m["role"] for m in trimmed]
+    assert trimmed[0] == history[0]
+    assert trimmed[-1]["content"] == "latest"
+    assert len(trimmed) <= 2 * 5
+    assert all(a != b for a, b in zip(roles, roles[1:]))
+    assert roles[0] == "user" and roles[1] == "assistant"
@@ -0,0 +1,91 @@
+"""Tests for TTSStreamer error propagation."""
+
+import asyncio
+
+import pytest
+
+from obs_harness import tts_pipeline
+from obs_harness.tts import AudioChunkWithTiming, CartesiaWSError, TTSProviderType, WordTiming
+from obs_harness.tts_pipeline import TextDisplayConfig, TTSStreamConfig, TTSStreamer
+
+
+class FakeTTSClient:
+    """TTS client whose socket drops after a fixed number of chunks."""
+
+    def __init__(self, chunks_before_drop: int | None = None) -> None:
+        self.chunks_before_drop = chunks_before_drop
+        self.input_closed = False
+        self._queue: asyncio.Queue[AudioChunkWithTiming | None] = asyncio.Queue()
+
+    async def connect(self, **kwargs) -> None:
+        pass
+
+    async def send_text(self, text: str, flush: bool = False) -> None:
+        if self.chunks_before_drop == 0:
+            return
+        self._queue.put_nowait(AudioChunkWithTiming(
+            audio=b"\x00\x00",
+            words=[WordTiming(word=text.strip(), start_time=0.0, end_time=0.1)],
+        ))
+        if self.chunks_before_drop is not None:
+            self.chunks_before_drop -= 1
+            if self.chunks_before_drop == 0:
+                # Mirrors the receive loops turning ConnectionClosed into the end sentinel
+                self._queue.put_nowait(None)
+
+    async def close_input(self) -> None:
+        self.input_closed = True
+        self._queue.put_nowait(None)
+
+    async def iter_audio_with_timing(self):
+        while (chunk := await self._queue.get()) is not None:
+            yield chunk
+
+    async def close(self) -> None:
+        pass
+
+
+async def _noop(*args) -> bool:
+    return True
+
+
+def _make_streamer(monkeypatch, client: FakeTTSClient) -> TTSStreamer:
+    monkeypatch.setattr(tts_pipeline, "create_tts_client", lambda **kwargs: client)
+    monkeypatch.setattr(tts_pipeline, "get_connect_kwargs", lambda provider, settings: {})
+    return TTSStreamer(
+        tts_config=TTSStreamConfig(provider=TTSProviderType.CARTESIA, settings={"voice_id": "v"}),
+        text_config=TextDisplayConfig(),
+        show_text=True,
+        send_text_start=_noop,
+        send_text_end=_noop,
+        send_audio_start=_noop,
+        send_audio_chunk=_noop,
+        send_audio_end=_noop,
+        send_word_timing=_noop,
+    )
+
+
+async def _tokens(*tokens: str):
+    for token in tokens:
+        await asyncio.sleep(0.01)
+        yield token
+
+
+def test_stream_returns_full_text(monkeypatch):
+    client = FakeTTSClient()
+    streamer = _make_streamer(monkeypatch, client)
+
+    text = asyncio.run(streamer.stream(_tokens("a ", "b ", "c")))
+
+    assert text == "a b c"
+    assert client.input_closed
+    assert streamer.get_spoken_text() == "a b c"
+
+
+def test_stream_raises_when_provider_disconnects_early(monkeypatch):
+    client = FakeTTSClient(chunks_before_drop=2)
+    streamer = _make_streamer(monkeypatch, client)
+
+    with pytest.raises(CartesiaWSError, match="ended before input was complete"):
+        asyncio.run(streamer.stream(_tokens("a ", "b ", "c ", "d")))
+    assert not client.input_closed